@@ -5,17 +5,20 @@ This package provides functionality for processing agenda entries.
 """
 
 from pathlib import Path
+import asyncio
+import os
 import sys
+import threading
 
 # Ensure the package directory is in the path
 PACKAGE_DIR = Path(__file__).resolve().parent
 if str(PACKAGE_DIR) not in sys.path:
     sys.path.append(str(PACKAGE_DIR.parent))
 
-# Export the main functions
-from jassist.agenda.agenda_processor import process_agenda_entry
 from jassist.logger_utils.logger_utils import setup_logger
 
+logger = setup_logger("agenda", module="agenda")
+
 def insert_into_agenda(text: str, metadata=None) -> bool:
     """
     Process a voice entry for agenda insertion.
@@ -30,8 +33,9 @@ def insert_into_agenda(text: str, metadata=None) -> bool:
     Returns:
         bool: True if processing was successful, False otherwise
     """
-    # Get logger instance
-    logger = setup_logger("agenda", module="agenda")
+    # Imported on first use: the processor pulls in the Google and OpenAI
+    # client libraries, which packages importing jassist.agenda may not need
+    from jassist.agenda.agenda_processor import process_agenda_entry
     
     # Extract db_id from metadata if it exists
     db_id = None
@@ -53,7 +57,53 @@ def insert_into_agenda(text: str, metadata=None) -> bool:
     
     return success
 
-# Initialize logging when the package is imported
-logger = setup_logger("agenda_init", module="agenda")
+async def insert_into_agenda_async(text: str, metadata=None) -> bool:
+    """
+    Asynchronous variant of insert_into_agenda.
+    
+    Runs the blocking agenda pipeline in the default executor so callers
+    can process many entries concurrently with asyncio.gather. Each
+    executor worker sends its entries on its own Assistants thread, since
+    a thread only accepts one active run at a time.
+    
+    Args:
+        text: The voice entry text
+        metadata: Optional metadata from the router, may contain db_id
+        
+    Returns:
+        bool: True if processing was successful, False otherwise
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, insert_into_agenda, text, metadata)
+
+ 
+
+def _warmup() -> None:
+    """
+    Build the agenda clients ahead of the first entry.
+    
+    Loads the agenda config, creates the cached OpenAI assistant client and
+    builds the Google Calendar service so the first real request finds
+    them ready. The Calendar service is only built when a token already
+    exists, since first-time setup needs an interactive login.
+    """
+    try:
+        from jassist.agenda.utils.config_manager import load_agenda_config
+        from jassist.agenda.llm.openai_client import _get_client
+        from jassist.agenda.google_agenda import get_agenda_service, get_credentials_path
+        
+        config = load_agenda_config()
+        _get_client()
+        
+        use_google_agenda = config.get('google_agenda', {}).get('use_google_agenda', True)
+        if use_google_agenda and (get_credentials_path() / "token.json").exists():
+            get_agenda_service()
+        
+        logger.debug("Agenda warmup complete")
+    except Exception as e:
+        # Warmup is best effort; the first request will retry and report errors
+        logger.warning(f"Agenda warmup failed: {e}")
 
- 
\ No newline at end of file
+# Opt-in so imports stay side-effect free unless explicitly requested
+if os.environ.get("JASSIST_WARMUP") == "1":
+    threading.Thread(target=_warmup, name="agenda-warmup", daemon=True).start()
@@ -5,10 +5,13 @@ This module processes agenda entries and inserts them into
 the database and Google agenda.
 """
 
+import copy
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, Tuple
 from .llm.openai_client import process_with_openai_assistant
 from .utils.json_extractor import extract_json_from_text
-from .db.agenda_db import save_agenda_event
+from .db.agenda_db import AgendaEvent, save_agenda_event
 from .google_agenda import insert_event_into_google_agenda
 from .utils.config_manager import load_agenda_config
 from jassist.logger_utils.logger_utils import setup_logger
@@ -16,6 +19,28 @@ from jassist.db_utils.db_manager import marcar_transcricao_processada
 
 logger = setup_logger("agenda_processor", module="agenda")
 
+# Event fields as (normalized key, English key, Portuguese key, default)
+_EVENT_FIELDS = (
+    ("resumo", "summary", "resumo", ""),
+    ("descricao", "description", "descricao", ""),
+    ("localizacao", "location", "localizacao", ""),
+    ("participantes", "attendees", "participantes", None),
+    ("recorrencia", "recurrence", "recorrencia", None),
+    ("lembretes", "reminders", "lembretes", None),
+    ("visibilidade", "visibility", "visibilidade", None),
+    ("cor_id", "colorId", "cor_id", None),
+    ("transparencia", "transparency", "transparencia", None),
+    ("estado", "status", "estado", None),
+)
+
+# Start/end time blocks as (date-time key, timezone key, English key, Portuguese key)
+_TIME_FIELDS = (
+    ("inicio_data_hora", "inicio_fuso_horario", "start", "inicio"),
+    ("fim_data_hora", "fim_fuso_horario", "end", "fim"),
+)
+
+DEFAULT_TIMEZONE = "Europe/Lisbon"
+
 def normalize_event_fields(event_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Normalize event data fields from either English or Portuguese keys.
@@ -26,41 +51,20 @@ def normalize_event_fields(event_data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dict: Normalized event data with consistent field names
     """
-    # Basic fields
-    normalized = {}
-    
-    # Title/Summary field
-    normalized["resumo"] = event_data.get("summary") or event_data.get("resumo", "")
-    
-    # Description field
-    normalized["descricao"] = event_data.get("description") or event_data.get("descricao", "")
+    get = event_data.get
+    normalized = {key: get(en) or get(pt, default) for key, en, pt, default in _EVENT_FIELDS}
     
-    # Location field
-    normalized["localizacao"] = event_data.get("location") or event_data.get("localizacao", "")
-    
-    # Start time fields
-    start_info = event_data.get("start") or event_data.get("inicio", {})
-    normalized["inicio_data_hora"] = start_info.get("dateTime") or start_info.get("data_hora")
-    normalized["inicio_fuso_horario"] = start_info.get("timeZone") or start_info.get("fuso_horario", "Europe/Lisbon")
-    
-    # End time fields
-    end_info = event_data.get("end") or event_data.get("fim", {})
-    normalized["fim_data_hora"] = end_info.get("dateTime") or end_info.get("data_hora")
-    normalized["fim_fuso_horario"] = end_info.get("timeZone") or end_info.get("fuso_horario", "Europe/Lisbon")
-    
-    # Other fields
-    normalized["participantes"] = event_data.get("attendees") or event_data.get("participantes")
-    normalized["recorrencia"] = event_data.get("recurrence") or event_data.get("recorrencia")
-    normalized["lembretes"] = event_data.get("reminders") or event_data.get("lembretes")
-    normalized["visibilidade"] = event_data.get("visibility") or event_data.get("visibilidade")
-    normalized["cor_id"] = event_data.get("colorId") or event_data.get("cor_id")
-    normalized["transparencia"] = event_data.get("transparency") or event_data.get("transparencia")
-    normalized["estado"] = event_data.get("status") or event_data.get("estado")
+    # Start and end time fields
+    for datetime_key, timezone_key, en, pt in _TIME_FIELDS:
+        time_info = get(en) or get(pt, {})
+        normalized[datetime_key] = time_info.get("dateTime") or time_info.get("data_hora")
+        normalized[timezone_key] = time_info.get("timeZone") or time_info.get("fuso_horario", DEFAULT_TIMEZONE)
     
     return normalized
 
 def process_agenda_entry(text: str, db_id: Optional[int] = None, 
-                      skip_db: bool = False, skip_calendar: bool = False) -> Tuple[bool, Optional[Dict[str, Any]]]:
+                      skip_db: bool = False, skip_calendar: bool = False,
+                      include_traceback: bool = False) -> Tuple[bool, Optional[Dict[str, Any]]]:
     """
     Process a voice entry for a agenda event.
     
@@ -69,9 +73,15 @@ def process_agenda_entry(text: str, db_id: Optional[int] = None,
         db_id: Optional ID of the database record this is associated with
         skip_db: If True, skip database operations
         skip_calendar: If True, skip Google Calendar operations
+        include_traceback: If True, add the formatted traceback to the error result
         
     Returns:
         Tuple containing (success status, event data or error message)
+        
+        The database save and the Calendar insert run concurrently, so the
+        Calendar event is created even if the save fails. That outcome is
+        still a success: the event data carries a "warning" and the
+        "google_agenda_link", and retrying it would duplicate the event.
     """
     try:
         logger.info("Processing agenda entry")
@@ -93,7 +103,7 @@ def process_agenda_entry(text: str, db_id: Optional[int] = None,
                 return False, {"error": "Failed to extract JSON from LLM response", "raw_response": response}
             
             # Debug output
-            logger.info(f"Extracted event data: {event_data}")
+            logger.info("Extracted event data: %s", event_data)
         except Exception as e:
             logger.exception(f"Error extracting JSON: {e}")
             return False, {"error": f"JSON extraction failed: {str(e)}", "raw_response": response}
@@ -101,30 +111,26 @@ def process_agenda_entry(text: str, db_id: Optional[int] = None,
         # Normalize event fields to handle both English and Portuguese field names
         normalized_data = normalize_event_fields(event_data)
         
+        # Steps 3 and 4 are independent network round-trips, so run the
+        # database save and the Google Calendar insert concurrently
+        db_future = None
+        calendar_future = None
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            if not skip_db:
+                db_future = executor.submit(save_agenda_event, AgendaEvent(**normalized_data), db_id)
+            if not skip_calendar:
+                # Send a deep copy: the insert fills in attendee emails, and the
+                # database record shares the attendee dicts with event_data
+                calendar_future = executor.submit(insert_event_into_google_agenda, copy.deepcopy(event_data))
+        
         # Step 3: Save to database (if not skipped)
         event_id = None
-        if not skip_db:
+        if db_future is not None:
             try:
-                event_id = save_agenda_event(
-                    resumo=normalized_data["resumo"],
-                    descricao=normalized_data["descricao"],
-                    localizacao=normalized_data["localizacao"],
-                    inicio_data_hora=normalized_data["inicio_data_hora"],
-                    fim_data_hora=normalized_data["fim_data_hora"],
-                    inicio_fuso_horario=normalized_data["inicio_fuso_horario"],
-                    fim_fuso_horario=normalized_data["fim_fuso_horario"],
-                    participantes=normalized_data["participantes"],
-                    recorrencia=normalized_data["recorrencia"],
-                    lembretes=normalized_data["lembretes"],
-                    visibilidade=normalized_data["visibilidade"],
-                    cor_id=normalized_data["cor_id"],
-                    transparencia=normalized_data["transparencia"],
-                    estado=normalized_data["estado"],
-                    criado_em=db_id
-                )
+                event_id = db_future.result()
                 
                 if event_id:
-                    logger.info(f"Event saved to database with ID: {event_id}")
+                    logger.info("Event saved to database with ID: %s", event_id)
                 else:
                     logger.error("Failed to save event to database")
                     if not skip_calendar:
@@ -143,11 +149,11 @@ def process_agenda_entry(text: str, db_id: Optional[int] = None,
             logger.info("Skipping database operations as requested")
             
         # Step 4: Add to Google Calendar (if not skipped)
-        if not skip_calendar:
+        if calendar_future is not None:
             try:
-                link = insert_event_into_google_agenda(event_data)
+                link = calendar_future.result()
                 if link:
-                    logger.info(f"Google agenda event created at: {link}")
+                    logger.info("Google agenda event created at: %s", link)
                     event_data["google_agenda_link"] = link
                 else:
                     logger.warning("Google agenda event creation failed")
@@ -173,7 +179,7 @@ def process_agenda_entry(text: str, db_id: Optional[int] = None,
                         destino_tabela="agenda",
                         destino_id=event_id
                     )
-                    logger.info(f"Marked transcription {db_id} as processed")
+                    logger.info("Marked transcription %s as processed", db_id)
             except Exception as e:
                 logger.warning(f"Failed to mark transcription as processed: {e}")
                 if event_data and isinstance(event_data, dict):
@@ -183,7 +189,9 @@ def process_agenda_entry(text: str, db_id: Optional[int] = None,
         return True, event_data
         
     except Exception as e:
+        # logger.exception already records the traceback in the logs
         logger.exception(f"Error during agenda processing: {e}")
-        import traceback
-        error_traceback = traceback.format_exc()
-        return False, {"error": f"Agenda processing error: {str(e)}", "traceback": error_traceback} 
\ No newline at end of file
+        error = {"error": f"Agenda processing error: {str(e)}"}
+        if include_traceback:
+            error["traceback"] = traceback.format_exc()
+        return False, error 
\ No newline at end of file
@@ -5,179 +5,204 @@ This module handles database operations specific to agenda events.
 """
 
 import json
+import weakref
+from dataclasses import dataclass
 from typing import Dict, Any, Optional, List
+from psycopg2.extras import execute_values
 from jassist.logger_utils.logger_utils import setup_logger
 from jassist.db_utils.db_connection import db_connection_handler
 
 logger = setup_logger("agenda_db", module="agenda")
 
-def save_agenda_event(
-    resumo: str,
-    localizacao: str,
-    descricao: str,
-    inicio_data_hora: str,
-    inicio_fuso_horario: str,
-    fim_data_hora: str,
-    fim_fuso_horario: str,
-    participantes: Optional[List[Dict[str, Any]]] = None,
-    recorrencia: Optional[List[str]] = None,
-    lembretes: Optional[Dict[str, Any]] = None,
-    visibilidade: Optional[str] = None,
-    cor_id: Optional[str] = None,
-    transparencia: Optional[str] = None,
-    estado: Optional[str] = None,
-    criado_em: Optional[str] = None
-) -> Optional[int]:
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _json_dumps(value: Any) -> str:
+    """
+    Serialize a value for a TEXT column holding JSON, using orjson when available.
+    
+    participantes, recorrencia and lembretes are TEXT columns. orjson
+    returns bytes, which psycopg2 sends as bytea and a TEXT column does
+    not accept, so the result is decoded back to str.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value)
+
+@dataclass
+class AgendaEvent:
+    """
+    A normalized agenda event, as stored in the agenda table.
+    
+    Built once from the output of normalize_event_fields and passed
+    through to the database layer unchanged.
+    """
+    __slots__ = (
+        "resumo", "descricao", "localizacao",
+        "inicio_data_hora", "inicio_fuso_horario",
+        "fim_data_hora", "fim_fuso_horario",
+        "participantes", "recorrencia", "lembretes",
+        "visibilidade", "cor_id", "transparencia", "estado",
+    )
+    
+    resumo: str
+    descricao: str
+    localizacao: str
+    inicio_data_hora: Optional[str]
+    inicio_fuso_horario: str
+    fim_data_hora: Optional[str]
+    fim_fuso_horario: str
+    participantes: Optional[List[Dict[str, Any]]]
+    recorrencia: Optional[List[str]]
+    lembretes: Optional[Dict[str, Any]]
+    visibilidade: Optional[str]
+    cor_id: Optional[str]
+    transparencia: Optional[str]
+    estado: Optional[str]
+
+def _event_row(event: AgendaEvent) -> tuple:
+    """
+    Build the agenda table row for an event, in column order.
+    
+    Args:
+        event: The event to store
+        
+    Returns:
+        tuple: Values for the agenda INSERT
+    """
+    return (
+        event.resumo,
+        event.descricao,
+        event.localizacao,
+        event.inicio_data_hora,
+        event.inicio_fuso_horario,
+        event.fim_data_hora,
+        event.fim_fuso_horario,
+        _json_dumps(event.participantes) if event.participantes else None,
+        _json_dumps(event.recorrencia) if event.recorrencia else None,
+        _json_dumps(event.lembretes) if event.lembretes else None,
+        event.visibilidade,
+        event.cor_id,
+        event.transparencia,
+        event.estado
+    )
+
+# Connections that already hold the prepared insert; entries go away with
+# their connection, e.g. when the pool closes connections above minconn
+_PREPARED_CONNECTIONS = weakref.WeakKeyDictionary()
+
+def _prepare_agenda_insert(conn, cur) -> None:
+    """
+    Prepare the agenda INSERT once per database session.
+    
+    Args:
+        conn: Database connection
+        cur: Cursor on that connection
+    """
+    if _PREPARED_CONNECTIONS.get(conn):
+        return
+        
+    cur.execute("SELECT 1 FROM pg_prepared_statements WHERE name = 'agenda_insert'")
+    if cur.fetchone() is None:
+        # Parameter types are inferred from the target columns
+        cur.execute("""
+        PREPARE agenda_insert AS
+        INSERT INTO agenda
+        (resumo, descricao, localizacao, 
+         inicio_data_hora, inicio_fuso_horario,
+         fim_data_hora, fim_fuso_horario,
+         participantes, recorrencia, lembretes,
+         visibilidade, cor_id, transparencia, estado)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14)
+        RETURNING id
+        """)
+        logger.debug("Prepared agenda_insert statement")
+        
+    _PREPARED_CONNECTIONS[conn] = True
+
+@db_connection_handler
+def save_agenda_event(conn, event: AgendaEvent, criado_em: Optional[str] = None) -> Optional[int]:
     """
     Save a agenda event to the database.
     
     Args:
-        resumo: Event title/summary
-        inicio_data_hora: Start date and time in ISO format
-        fim_data_hora: End date and time in ISO format
-        localizacao: Event location
-        descricao: Event description
-        inicio_fuso_horario: Timezone for start time
-        fim_fuso_horario: Timezone for end time
-        participantes: List of attendees
-        recorrencia: Recurrence rules
-        lembretes: Reminder configuration
-        visibilidade: Event visibility
-        cor_id: Event color
-        transparencia: Whether event blocks time
-        estado: Event status
+        conn: Database connection (injected by decorator)
+        event: The normalized event to save
         criado_em: Optional ID of the transcription this event is from
         
     Returns:
         int: ID of the saved event, or None if save failed
     """
     try:
-        logger.debug(f"Saving agenda event: {resumo}")
-            
-        # Log key details for debugging
-        logger.debug(f"Event details: summary={resumo}, location={localizacao}")
-        logger.debug(f"Event times: start={inicio_data_hora}, end={fim_data_hora}")
-            
-        # Save to database
-        event_id = _save_agenda_event_to_db_direct(
-            resumo=resumo,
-            descricao=descricao,
-            localizacao=localizacao,
-            inicio_data_hora=inicio_data_hora,
-            inicio_fuso_horario=inicio_fuso_horario,
-            fim_data_hora=fim_data_hora,
-            fim_fuso_horario=fim_fuso_horario,
-            participantes=participantes,
-            recorrencia=recorrencia,
-            lembretes=lembretes,
-            visibilidade=visibilidade,
-            cor_id=cor_id,
-            transparencia=transparencia,
-            estado=estado,
-            id_transcricao=criado_em
-        )
-        
-        if event_id:
-            logger.info(f"Successfully saved agenda event with ID: {event_id}")
-        else:
-            logger.error("Failed to save agenda event to database")
-            
+        cur = conn.cursor()
+        
+        logger.debug("Saving agenda event: resumo=%s, localizacao=%s, inicio_data_hora=%s, fim_data_hora=%s",
+                     event.resumo, event.localizacao, event.inicio_data_hora, event.fim_data_hora)
+        
+        # Insert the event through the statement prepared on this connection
+        _prepare_agenda_insert(conn, cur)
+        cur.execute("""
+        EXECUTE agenda_insert (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """, _event_row(event))
+        
+        # Get the ID of the inserted record
+        result = cur.fetchone()
+        event_id = result[0] if result else None
+        
+        conn.commit()
+        
+        logger.info("Agenda event saved to database with ID: %s", event_id)
+        
         return event_id
         
     except Exception as e:
-        logger.exception(f"Error saving agenda event to database: {e}")
+        conn.rollback()
+        logger.error(f"Error saving agenda event to database: {e}")
         return None
 
 @db_connection_handler
-def _save_agenda_event_to_db_direct(
-    conn, 
-    resumo, 
-    descricao, 
-    localizacao, 
-    inicio_data_hora, 
-    inicio_fuso_horario,
-    fim_data_hora, 
-    fim_fuso_horario,
-    participantes=None,
-    recorrencia=None,
-    lembretes=None,
-    visibilidade=None,
-    cor_id=None,
-    transparencia=None,
-    estado=None, 
-    id_transcricao=None
-) -> int:
+def save_agenda_events_bulk(conn, events: List[AgendaEvent]) -> Optional[List[int]]:
     """
-    Direct function to save an agenda event to the database with explicit parameters.
+    Save several agenda events to the database in a single transaction.
     
     Args:
         conn: Database connection (injected by decorator)
-        resumo: Event summary
-        descricao: Event description
-        localizacao: Event location
-        inicio_data_hora: Start date and time
-        inicio_fuso_horario: Start timezone
-        fim_data_hora: End date and time
-        fim_fuso_horario: End timezone
-        participantes: Event attendees
-        recorrencia: Recurrence rules
-        lembretes: Reminders
-        visibilidade: Visibility
-        cor_id: Color ID
-        transparencia: Transparency
-        estado: Status
-        id_transcricao: Optional ID of the transcription this event is from
+        events: List of normalized events
         
     Returns:
-        int: ID of the saved event, or None if save failed
+        List[int]: IDs of the saved events in input order, or None if save failed
     """
+    if not events:
+        return []
+        
     try:
         cur = conn.cursor()
         
-        # Better debugging info
-        logger.debug(f"DB insertion data: resumo={resumo}, descricao={descricao}, localizacao={localizacao}")
-        logger.debug(f"DB insertion time: inicio_data_hora={inicio_data_hora}, fim_data_hora={fim_data_hora}")
+        rows = [_event_row(event) for event in events]
         
-        # Insert the event - corrected for the actual database schema
-        cur.execute("""
+        # One statement per page instead of one round-trip per event
+        event_ids = execute_values(cur, """
         INSERT INTO agenda
         (resumo, descricao, localizacao, 
          inicio_data_hora, inicio_fuso_horario,
          fim_data_hora, fim_fuso_horario,
          participantes, recorrencia, lembretes,
          visibilidade, cor_id, transparencia, estado)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        VALUES %s
         RETURNING id
-        """, (
-            resumo,
-            descricao,
-            localizacao,
-            inicio_data_hora,
-            inicio_fuso_horario,
-            fim_data_hora,
-            fim_fuso_horario,
-            json.dumps(participantes) if participantes else None,
-            json.dumps(recorrencia) if recorrencia else None,
-            json.dumps(lembretes) if lembretes else None,
-            visibilidade,
-            cor_id,
-            transparencia,
-            estado
-        ))
-        
-        # Get the ID of the inserted record
-        result = cur.fetchone()
-        event_id = result[0] if result else None
+        """, rows, page_size=500, fetch=True)
         
         conn.commit()
         
-        logger.info(f"Agenda event saved to database with ID: {event_id}")
+        event_ids = [row[0] for row in event_ids]
+        logger.info("Saved %s agenda events to database", len(event_ids))
         
-        return event_id
+        return event_ids
         
     except Exception as e:
         conn.rollback()
-        logger.error(f"Error saving agenda event to database: {e}")
+        logger.error(f"Error saving agenda events to database: {e}")
         return None
-
-
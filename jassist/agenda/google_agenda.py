@@ -7,9 +7,12 @@ This module handles interactions with the Google agenda API.
 import os
 import json
 import logging
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional
+import httplib2
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
@@ -23,10 +26,23 @@ logger = setup_logger("google_agenda", module="agenda")
 # Define the scopes required for Google agenda
 SCOPES = ['https://www.googleapis.com/auth/calendar']
 
+# Process-wide Calendar service, built once and refreshed in place
+_SERVICE = None
+_CREDENTIALS = None
+_TOKEN_PATH = None
+_SERVICE_LOCK = threading.Lock()
+
+# httplib2.Http is not thread-safe, so each worker thread keeps its own
+# keep-alive connection to the Calendar API
+_http_state = threading.local()
+
 def get_credentials_path() -> Path:
     """
     Get path to Google API credentials.
     
+    The directory is not created here; that only happens on first-time
+    setup, when a new token has to be written.
+    
     Returns:
         Path: Path to the credentials directory
     """
@@ -37,20 +53,77 @@ def get_credentials_path() -> Path:
     
     # Get credentials directory from config or use default
     credentials_dir = config.get('paths', {}).get('credentials_directory', 'credentials')
-    credentials_path = resolve_path(credentials_dir, module_dir)
+    return resolve_path(credentials_dir, module_dir)
+
+def _save_token(creds: Credentials, token_path: Path) -> None:
+    """
+    Persist credentials so the next run can reuse them.
     
-    # Create directory if it doesn't exist
-    ensure_directory_exists(credentials_path, "credentials directory")
+    The file is only rewritten when its contents would change, and the
+    write goes through a temporary file so a crash never leaves a
+    truncated token behind.
     
-    return credentials_path
+    Args:
+        creds: The credentials to save
+        token_path: Path to the token file
+    """
+    try:
+        new_token = creds.to_json().encode("utf-8")
+        try:
+            if token_path.read_bytes() == new_token:
+                logger.debug("Token at %s is unchanged, not rewriting", token_path)
+                return
+        except FileNotFoundError:
+            pass
+        
+        tmp_path = token_path.with_suffix(".tmp")
+        tmp_path.write_bytes(new_token)
+        os.replace(tmp_path, token_path)
+        logger.debug("Token saved to %s", token_path)
+    except Exception as e:
+        # Non-fatal error - we can continue with the credential in memory
+        logger.warning(f"Failed to save token to {token_path}: {e}")
 
 def get_agenda_service():
     """
-    Get an authenticated Google agenda service.
+    Get the authenticated Google agenda service.
+    
+    The service is built once per process. Later calls reuse it and only
+    refresh the credentials when they have expired.
     
     Returns:
         Resource: Google agenda service
         
+    Raises:
+        ValueError: If credentials_filename is missing from config
+        FileNotFoundError: If credentials file not found
+        Exception: For other authentication errors
+    """
+    global _SERVICE, _CREDENTIALS, _TOKEN_PATH
+    
+    with _SERVICE_LOCK:
+        if _SERVICE is not None:
+            if _CREDENTIALS.valid:
+                return _SERVICE
+            if _CREDENTIALS.expired and _CREDENTIALS.refresh_token:
+                try:
+                    logger.debug("Refreshing expired token for cached service")
+                    _CREDENTIALS.refresh(Request())
+                    _save_token(_CREDENTIALS, _TOKEN_PATH)
+                    return _SERVICE
+                except Exception as e:
+                    logger.warning(f"Token refresh failed, rebuilding service: {e}")
+        
+        _SERVICE, _CREDENTIALS, _TOKEN_PATH = _build_agenda_service()
+        return _SERVICE
+
+def _build_agenda_service():
+    """
+    Build an authenticated Google agenda service.
+    
+    Returns:
+        Tuple: (service, credentials, token path)
+        
     Raises:
         ValueError: If credentials_filename is missing from config
         FileNotFoundError: If credentials file not found
@@ -68,25 +141,24 @@ def get_agenda_service():
         logger.error("No credentials filename specified in config")
         raise ValueError("Missing credentials_filename in config - update agenda_config.json")
     
-    logger.debug(f"Looking for credentials file: {credentials_filename}")
-    
-    # Look for credentials in module credentials directory first
-    credentials_path = credentials_dir / credentials_filename
+    logger.debug("Looking for credentials file: %s", credentials_filename)
     
-    # Fallback to the main jassist credentials directory if not found
-    if not credentials_path.exists():
-        project_root = Path(__file__).resolve().parent.parent.parent
-        alt_path = project_root / "jassist" / "credentials" / credentials_filename
-        logger.debug(f"Credentials not found at {credentials_path}, checking {alt_path}")
-        if alt_path.exists():
-            credentials_path = alt_path
+    # Look for credentials in module credentials directory first, then
+    # fall back to the main jassist credentials directory
+    project_root = Path(__file__).resolve().parent.parent.parent
+    candidates = (
+        credentials_dir / credentials_filename,
+        project_root / "jassist" / "credentials" / credentials_filename,
+    )
+    credentials_path = next((path for path in candidates if path.is_file()), candidates[0])
     
     # Check if token already exists and try to load it
-    if token_path.exists():
+    token_exists = token_path.exists()
+    if token_exists:
         try:
-            logger.debug(f"Loading existing token from {token_path}")
+            logger.debug("Loading existing token from %s", token_path)
             creds = Credentials.from_authorized_user_file(str(token_path), SCOPES)
-            logger.debug(f"Token loaded successfully. Valid: {creds.valid}, Expired: {getattr(creds, 'expired', 'N/A')}")
+            logger.debug("Token loaded successfully. Valid: %s, Expired: %s", creds.valid, getattr(creds, 'expired', 'N/A'))
         except Exception as e:
             logger.warning(f"Error loading existing token, will create new one: {e}")
             # Continue with flow to create new token
@@ -104,7 +176,7 @@ def get_agenda_service():
                 logger.warning(f"Token refresh failed, will create new one: {e}")
                 # Fall through to create new token
         else:
-            if not credentials_path.exists():
+            if not credentials_path.is_file():
                 error_msg = (
                     f"Google API credentials not found at {credentials_path}. "
                     "Download credentials.json from the Google Developer Console "
@@ -113,7 +185,7 @@ def get_agenda_service():
                 logger.error(error_msg)
                 raise FileNotFoundError(error_msg)
             
-            logger.info(f"Using credentials file: {credentials_path}")
+            logger.info("Using credentials file: %s", credentials_path)
             try:
                 flow = InstalledAppFlow.from_client_secrets_file(
                     str(credentials_path), SCOPES)
@@ -124,21 +196,39 @@ def get_agenda_service():
                 raise Exception(f"Failed to authenticate with Google: {e}")
             
         # Save the credentials for the next run
-        try:
-            with open(token_path, 'w') as token_file:
-                token_file.write(creds.to_json())
-            logger.debug(f"Token saved to {token_path}")
-        except Exception as e:
-            # Non-fatal error - we can continue with the credential in memory
-            logger.warning(f"Failed to save token to {token_path}: {e}")
+        if not token_exists:
+            ensure_directory_exists(credentials_dir, "credentials directory")
+        _save_token(creds, token_path)
 
     try:
-        service = build('calendar', 'v3', credentials=creds)
-        return service
+        # Use the discovery document bundled with the client library
+        # instead of fetching it over HTTPS
+        service = build('calendar', 'v3', credentials=creds,
+                        cache_discovery=False, static_discovery=True)
+        return service, creds, token_path
     except Exception as e:
         logger.error(f"Failed to build calendar service: {e}")
         raise Exception(f"Failed to initialize Google Calendar API: {e}")
 
+def _get_authorized_http(creds: Credentials) -> AuthorizedHttp:
+    """
+    Get the persistent authorized HTTP transport for the current thread.
+    
+    The transport keeps its TLS connection open between requests, so only
+    the first insert on a thread pays for the handshake.
+    
+    Args:
+        creds: The credentials used to authorize requests
+        
+    Returns:
+        AuthorizedHttp: Transport bound to the given credentials
+    """
+    http = getattr(_http_state, "http", None)
+    if http is None or http.credentials is not creds:
+        http = AuthorizedHttp(creds, http=httplib2.Http())
+        _http_state.http = http
+    return http
+
 def insert_event_into_google_agenda(event_data: Dict[str, Any]) -> Optional[str]:
     """
     Insert an event into Google agenda.
@@ -158,28 +248,31 @@ def insert_event_into_google_agenda(event_data: Dict[str, Any]) -> Optional[str]
         return None
     
     agenda_id = config.get('google_agenda', {}).get('agenda_id', 'primary')
-    logger.debug(f"Using calendar ID: {agenda_id}")
+    logger.debug("Using calendar ID: %s", agenda_id)
     
     # Check and fix attendees with missing email addresses
-    if "attendees" in event_data and event_data["attendees"]:
-        logger.debug(f"Checking {len(event_data['attendees'])} attendees for missing email addresses")
-        for i, attendee in enumerate(event_data["attendees"]):
+    attendees = event_data.get("attendees")
+    if attendees:
+        for attendee in attendees:
             if not attendee.get("email"):
-                logger.warning(f"Attendee #{i+1} missing email, adding dummy email: dummy@example.com")
+                logger.warning("Attendee %s missing email, adding dummy email: dummy@example.com",
+                               attendee.get("displayName", ""))
                 attendee["email"] = "dummy@example.com"
     
-    logger.debug(f"Event data for Google Calendar: {event_data}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Event data for Google Calendar: %s", event_data)
     
     try:
         logger.info("Getting Google Calendar service...")
         service = get_agenda_service()
+        http = _get_authorized_http(_CREDENTIALS)
         logger.info("Inserting event into Google Calendar...")
         event = service.events().insert(
             calendarId=agenda_id,
             body=event_data
-        ).execute()
+        ).execute(http=http)
 
-        logger.info(f"Event created: {event.get('htmlLink')}")
+        logger.info("Event created: %s", event.get('htmlLink'))
         return event.get("htmlLink")
         
     except HttpError as error:
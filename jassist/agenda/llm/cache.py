@@ -0,0 +1,99 @@
+"""
+Response cache for agenda processing.
+
+This module caches assistant responses for agenda entries so that
+repeated entries do not trigger another OpenAI round-trip.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+from jassist.logger_utils.logger_utils import setup_logger
+
+logger = setup_logger("agenda_cache", module="agenda")
+
+# Maximum number of responses kept in memory
+MAX_CACHE_SIZE = 256
+
+# Entries resolved against the current time rather than the date, e.g.
+# "daqui a 2 horas" or "in 30 minutes"; their responses are not cached
+_TIME_RELATIVE = re.compile(
+    r"\b(?:daqui|dentro\s+de|agora|mais\s+tarde|minutos?|horas?|"
+    r"now|later|minutes?|hours?)\b",
+    re.IGNORECASE
+)
+
+_RESPONSE_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+def _cache_key(entry_content: str) -> Optional[str]:
+    """
+    Build the cache key for an entry.
+
+    The entry's whitespace is collapsed; case is kept, since names and
+    places can differ only by case. The current date is part of the key
+    because the prompt resolves relative dates ("tomorrow", "next monday")
+    against it. Entries relative to the current time are not cached, since
+    the prompt's current time changes every second.
+
+    Args:
+        entry_content: The agenda entry text
+
+    Returns:
+        str: SHA-256 hex digest identifying the entry, or None if the
+        entry must not be cached
+    """
+    if _TIME_RELATIVE.search(entry_content):
+        return None
+    normalized = " ".join(entry_content.split())
+    today = datetime.now().strftime("%Y-%m-%d")
+    return hashlib.sha256(f"{today}\n{normalized}".encode("utf-8")).hexdigest()
+
+def get_cached_response(entry_content: str) -> Optional[str]:
+    """
+    Get a cached assistant response for an entry.
+
+    Args:
+        entry_content: The agenda entry text
+
+    Returns:
+        str: The cached response, or None if not cached
+    """
+    key = _cache_key(entry_content)
+    if key is None:
+        return None
+    with _CACHE_LOCK:
+        response = _RESPONSE_CACHE.get(key)
+        if response is not None:
+            _RESPONSE_CACHE.move_to_end(key)
+    if response is not None:
+        logger.debug("Using cached assistant response for agenda entry")
+    return response
+
+def cache_response(entry_content: str, response: str) -> None:
+    """
+    Store an assistant response for an entry.
+
+    Args:
+        entry_content: The agenda entry text
+        response: The assistant's response
+    """
+    key = _cache_key(entry_content)
+    if key is None:
+        return
+    with _CACHE_LOCK:
+        _RESPONSE_CACHE[key] = response
+        _RESPONSE_CACHE.move_to_end(key)
+        while len(_RESPONSE_CACHE) > MAX_CACHE_SIZE:
+            _RESPONSE_CACHE.popitem(last=False)
+
+def clear_cache() -> None:
+    """
+    Clear all cached responses.
+    """
+    with _CACHE_LOCK:
+        _RESPONSE_CACHE.clear()
+    logger.debug("Cleared agenda response cache")
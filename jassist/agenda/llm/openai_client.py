@@ -5,26 +5,106 @@ This module handles interactions with the OpenAI API.
 """
 
 import os
+import functools
+import threading
 from datetime import datetime
+from jassist.api_assistants_cliente.api_assistants_cliente import OpenAIAssistantClient
+from jassist.api_assistants_cliente.config_manager import load_assistant_config
+from jassist.api_assistants_cliente.exceptions import ConfigError
 from jassist.api_assistants_cliente.adapters.agenda_adapter import process_with_agenda_assistant
+from jassist.agenda.utils.config_manager import get_config_dir
+from jassist.agenda.llm.cache import get_cached_response, cache_response
 from jassist.logger_utils.logger_utils import setup_logger
 
 logger = setup_logger("openai_client", module="agenda")
 
+AGENDA_ASSISTANT_NAME = "Agenda Entry Parser"
+
+# Per-thread state so each thread of execution reuses its own Assistants API
+# thread; a thread only accepts one active run at a time
+_thread_state = threading.local()
+
+@functools.lru_cache(maxsize=1)
+def _get_client() -> OpenAIAssistantClient:
+    """
+    Get the process-wide OpenAI Assistant Client for agenda processing.
+
+    The client is built once from the agenda assistant config and reused
+    for every subsequent entry.
+
+    Returns:
+        OpenAIAssistantClient: Configured client
+
+    Raises:
+        ConfigError: If the agenda assistant configuration is missing
+    """
+    config = load_assistant_config(
+        module_name="agenda",
+        assistant_name=AGENDA_ASSISTANT_NAME,
+        config_file=get_config_dir() / "agenda_assistant_config.json"
+    )
+    if not config:
+        raise ConfigError("No configuration found for agenda module.")
+
+    logger.debug("Created cached OpenAI assistant client for agenda")
+    return OpenAIAssistantClient(
+        config=config,
+        assistant_name=AGENDA_ASSISTANT_NAME,
+        module_name="agenda"
+    )
+
+def _get_thread_id(client: OpenAIAssistantClient) -> str:
+    """
+    Get the thread ID reused by the current thread of execution.
+
+    Each thread of execution gets its own unsaved Assistants thread, so
+    entries processed concurrently never start runs on the same thread.
+
+    Args:
+        client: The OpenAI Assistant Client
+
+    Returns:
+        str: Thread ID
+    """
+    thread_id = getattr(_thread_state, "thread_id", None)
+    if not thread_id:
+        thread_id = client.get_or_create_thread(
+            thread_key=f"agenda_{threading.get_ident()}",
+            save_to_config=False
+        )
+        _thread_state.thread_id = thread_id
+    return thread_id
+
 def process_with_openai_assistant(entry_content: str) -> str:
     """
     Process a agenda entry using OpenAI's assistant API.
-    
+
     Args:
         entry_content: The agenda entry text to process
-        
+
     Returns:
         str: The assistant's response
     """
+    cached = get_cached_response(entry_content)
+    if cached is not None:
+        return cached
+
+    client = _get_client()
+
     # Use the centralized assistant client through the agenda adapter
-    response = process_with_agenda_assistant(entry_content)
-    
+    try:
+        response = process_with_agenda_assistant(
+            entry_content,
+            client=client,
+            thread_id=_get_thread_id(client)
+        )
+    except Exception:
+        # Drop the cached thread so the next entry looks it up again
+        _thread_state.thread_id = None
+        raise
+
     if not response:
         raise ValueError("No assistant response found")
-    
-    return response 
\ No newline at end of file
+
+    cache_response(entry_content, response)
+    return response
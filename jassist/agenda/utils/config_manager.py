@@ -7,6 +7,7 @@ This module centralizes configuration loading from various sources.
 import json
 import sys
 import os
+import functools
 from pathlib import Path
 from typing import Dict, Any
 from jassist.logger_utils.logger_utils import setup_logger
@@ -63,10 +64,14 @@ def load_json_config(file_name: str) -> Dict[str, Any]:
         logger.error(f"Error loading config file {file_name}: {e}")
         return {}
 
+@functools.lru_cache(maxsize=1)
 def load_agenda_config() -> Dict[str, Any]:
     """
     Load the agenda configuration.
     
+    The configuration is read once per process; call
+    load_agenda_config.cache_clear() after editing the file.
+    
     Returns:
         Dict containing the agenda configuration
     """
@@ -12,6 +12,14 @@ from jassist.logger_utils.logger_utils import setup_logger
 
 logger = setup_logger("json_extractor", module="agenda")
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so the
+# handlers below work with either parser
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 def extract_json_from_text(text: str) -> Optional[Dict[str, Any]]:
     """
     Extract a JSON object from text, handling different formats.
@@ -29,7 +37,7 @@ def extract_json_from_text(text: str) -> Optional[Dict[str, Any]]:
     try:
         # Try direct JSON parsing first
         try:
-            parsed_json = json.loads(text)
+            parsed_json = _json_loads(text)
             logger.debug("Successfully parsed text as direct JSON")
             return parsed_json
         except json.JSONDecodeError as e:
@@ -41,7 +49,7 @@ def extract_json_from_text(text: str) -> Optional[Dict[str, Any]]:
             logger.debug(f"Found {len(json_block_matches)} potential JSON code blocks")
             for i, match in enumerate(json_block_matches):
                 try:
-                    parsed_json = json.loads(match)
+                    parsed_json = _json_loads(match)
                     logger.debug(f"Successfully parsed JSON from code block #{i+1}")
                     return parsed_json
                 except json.JSONDecodeError as e:
@@ -55,7 +63,7 @@ def extract_json_from_text(text: str) -> Optional[Dict[str, Any]]:
             try:
                 curly_content = curly_match.group(1)
                 logger.debug(f"Found content between curly braces (length: {len(curly_content)})")
-                parsed_json = json.loads(curly_content)
+                parsed_json = _json_loads(curly_content)
                 logger.debug("Successfully parsed JSON from curly braces content")
                 return parsed_json
             except json.JSONDecodeError as e:
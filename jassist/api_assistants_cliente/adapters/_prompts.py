@@ -0,0 +1,196 @@
+"""
+Prompt file loading shared by the assistant adapters.
+
+This module loads prompts.yaml files, flattens them to their template
+strings and caches the result until the file changes. It also formats the
+current date and time that prompt templates reference.
+"""
+
+import functools
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from jassist.logger_utils.logger_utils import setup_logger
+from ..config_manager import load_compiled_prompts
+from ..exceptions import ConfigError
+
+logger = setup_logger("adapter_prompts", module="api_assistants_cliente")
+
+# Maximum number of (path, mtime) prompt files kept in memory
+MAX_CACHED_PROMPT_FILES = 32
+
+# Serializes cache misses so concurrent adapters parse a file only once
+_LOAD_LOCK = threading.Lock()
+
+def file_signature(path: Optional[Path]) -> Optional[Tuple[int, int]]:
+    """
+    Get a file's modification time and size, used to spot edits to cached files.
+
+    The size catches edits that land within the filesystem's mtime
+    resolution. Both come from a single stat call.
+
+    Args:
+        path: Path to the file, or None
+
+    Returns:
+        Tuple: (modification time in nanoseconds, size in bytes), or None if
+        the file cannot be read
+    """
+    if path is None:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def _load_prompt_file(prompts_path: Path) -> Dict[str, str]:
+    """
+    Load and flatten prompts from a specific file.
+
+    A pre-compiled prompts.json is used when it is up to date; otherwise
+    the YAML is parsed.
+
+    Args:
+        prompts_path: Path to the prompts file
+
+    Returns:
+        Dict: Template text by prompt name
+
+    Raises:
+        ConfigError: If the prompts file is missing or invalid
+    """
+    if not prompts_path.exists():
+        raise ConfigError(f"Prompts file not found: {prompts_path}")
+
+    try:
+        # Prefer the pre-compiled JSON copy when it is up to date
+        prompts = load_compiled_prompts(prompts_path)
+        if not prompts:
+            # PyYAML is only needed without a compiled copy, so it is imported here.
+            # The libyaml-backed loader is used when PyYAML was built with it.
+            import yaml
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+            # One read of the whole file; libyaml decodes the bytes itself
+            prompts_data = yaml.load(prompts_path.read_bytes(), Loader=loader)
+            prompts = prompts_data.get('prompts', {})
+        if not prompts:
+            raise ConfigError(f"No prompts found in file: {prompts_path}")
+    except Exception as e:
+        raise ConfigError(f"Error loading prompts file {prompts_path}: {e}")
+
+    return _flatten_templates(prompts)
+
+def _flatten_templates(prompts: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Reduce prompt entries to their template text.
+
+    Args:
+        prompts: Prompt entries by name
+
+    Returns:
+        Dict: Template text by prompt name, without entries lacking a template
+    """
+    return {
+        name: data["template"]
+        for name, data in prompts.items()
+        if isinstance(data, dict) and data.get("template")
+    }
+
+@functools.lru_cache(maxsize=MAX_CACHED_PROMPT_FILES)
+def _load_prompts_cached(prompts_path: str, signature: Optional[Tuple[int, int]]) -> Dict[str, str]:
+    """
+    Load prompts for a path at a given modification time and size.
+
+    The file signature is part of the cache key, so an edited file
+    misses the cache and its old entry ages out of the LRU.
+
+    Args:
+        prompts_path: Path to the prompts file
+        signature: The file's (modification time, size)
+
+    Returns:
+        Dict: Template text by prompt name
+    """
+    logger.debug("Caching prompts from %s", prompts_path)
+    return _load_prompt_file(Path(prompts_path))
+
+def load_prompts(prompts_path: Path, use_cache: bool = True) -> Dict[str, str]:
+    """
+    Load the prompt templates from a prompts file.
+
+    Results are cached per path and reused until the file's modification
+    time or size changes. Prompts without a template are left out.
+
+    Args:
+        prompts_path: Path to the prompts file
+        use_cache: Whether to use and update the cache
+
+    Returns:
+        Dict: Template text by prompt name
+
+    Raises:
+        ConfigError: If the prompts file is missing or invalid
+    """
+    if not use_cache:
+        return _load_prompt_file(prompts_path)
+
+    signature = file_signature(prompts_path)
+    with _LOAD_LOCK:
+        return _load_prompts_cached(str(prompts_path), signature)
+
+def clear_prompts_cache() -> None:
+    """
+    Clear all cached prompt files.
+    """
+    _load_prompts_cached.cache_clear()
+    logger.debug("Cleared adapter prompts cache")
+
+# Formatted (epoch second, date, time) for the current second, shared by
+# requests that arrive within the same second
+_TS_CACHE = (0, "", "")
+
+def format_now() -> Tuple[str, str]:
+    """
+    Get the current date and time formatted for prompt templates.
+
+    Returns:
+        Tuple: (date as YYYY-MM-DD, time as HH:MM:SS)
+    """
+    global _TS_CACHE
+    epoch = int(time.time())
+    cached_epoch, current_date, current_time = _TS_CACHE
+    if epoch != cached_epoch:
+        now = datetime.fromtimestamp(epoch)
+        current_date = now.strftime("%Y-%m-%d")
+        current_time = now.strftime("%H:%M:%S")
+        _TS_CACHE = (epoch, current_date, current_time)
+    return current_date, current_time
+
+# Per-thread template variables reused by entry_template_vars
+_VARS_STATE = threading.local()
+
+def entry_template_vars(entry_content: str) -> Dict[str, str]:
+    """
+    Get the template variables for an entry prompt.
+
+    The same dict is refilled on every call from a given thread instead of
+    building a new one, so callers must not keep it past the request.
+
+    Args:
+        entry_content: The entry text
+
+    Returns:
+        Dict: entry_content, current_date and current_time
+    """
+    template_vars = getattr(_VARS_STATE, "template_vars", None)
+    if template_vars is None:
+        template_vars = _VARS_STATE.template_vars = {}
+    template_vars["entry_content"] = entry_content
+    template_vars["current_date"], template_vars["current_time"] = format_now()
+    return template_vars
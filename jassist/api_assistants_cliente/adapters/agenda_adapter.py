@@ -5,18 +5,50 @@ This module provides a specialized interface for agenda processing
 using the OpenAI Assistant Client.
 """
 
-from datetime import datetime
+import functools
+import string
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple
-import yaml
 
 from jassist.logger_utils.logger_utils import setup_logger
 from ..api_assistants_cliente import OpenAIAssistantClient
 from ..config_manager import load_assistant_config
-from ..exceptions import AssistantClientError, ConfigError
+from ..exceptions import AssistantClientError, ConfigError, RunError
+from ._prompts import load_prompts, clear_prompts_cache, file_signature, format_now
 
 logger = setup_logger("agenda_adapter", module="api_assistants_cliente")
 
+# Default config and prompt locations in the agenda module, resolved once
+_JASSIST_DIR = Path(__file__).resolve().parents[3]
+_DEFAULT_AGENDA_CONFIG = _JASSIST_DIR / "jassist" / "agenda" / "config" / "agenda_assistant_config.json"
+_DEFAULT_AGENDA_PROMPTS = _JASSIST_DIR / "jassist" / "agenda" / "config" / "prompts.yaml"
+
+# Serializes config cache misses so concurrent adapters load a file only once
+_CONFIG_LOCK = threading.Lock()
+
+@functools.lru_cache(maxsize=32)
+def _load_config_cached(config_file: str, signature: Optional[Tuple[int, int]]) -> Dict[str, Any]:
+    """
+    Load the agenda assistant configuration from a file.
+    
+    The file's modification time and size are part of the cache key, so an
+    edited config misses the cache and its old entry ages out of the LRU.
+    
+    Args:
+        config_file: Path to the config file
+        signature: The config file's (modification time, size)
+        
+    Returns:
+        Dict: Configuration dictionary
+    """
+    logger.debug("Caching configuration for %s", config_file)
+    return load_assistant_config(
+        module_name="agenda",
+        assistant_name="Agenda Entry Parser",
+        config_file=config_file
+    )
+
 class agendaAssistantAdapter:
     """
     Adapter for using the OpenAI Assistant Client with agenda processing.
@@ -48,16 +80,13 @@ class agendaAssistantAdapter:
         else:
             # Default config file path - use agenda_assistant_config.json in the agenda module
             if config_file is None:
-                jassist_dir = Path(__file__).resolve().parent.parent.parent.parent
-                config_file = jassist_dir / "jassist" / "agenda" / "config" / "agenda_assistant_config.json"
-                logger.info(f"Using agenda module config file: {config_file}")
+                config_file = _DEFAULT_AGENDA_CONFIG
+                logger.debug("Using agenda module config file: %s", config_file)
             
-            # Load configuration
-            config = load_assistant_config(
-                module_name=self.module_name,
-                assistant_name="Agenda Entry Parser",
-                config_file=config_file
-            )
+            # Load configuration from cache or file
+            config_signature = file_signature(config_file)
+            with _CONFIG_LOCK:
+                config = _load_config_cached(str(config_file), config_signature)
             
             if not config:
                 raise ConfigError(f"No configuration found for {self.module_name} module.")
@@ -73,50 +102,104 @@ class agendaAssistantAdapter:
         if prompts_file:
             prompts_path = prompts_file
         else:
-            # Use the module's config path - FIXED PATH CONSTRUCTION
-            # Get the jassist directory
-            jassist_dir = Path(__file__).resolve().parent.parent.parent.parent
-            
-            # Log the path to help with debugging
-            logger.info(f"jassist directory: {jassist_dir}")
-            
-            # Construct path to the agenda module's prompts file in the jassist directory
-            prompts_path = jassist_dir / "jassist" / "agenda" / "config" / "prompts.yaml"
+            prompts_path = _DEFAULT_AGENDA_PROMPTS
             
             # Log the final path to help with debugging
-            logger.info(f"Using prompts path: {prompts_path}")
+            logger.debug("Using prompts path: %s", prompts_path)
         
-        # Load prompts from the file
-        self.prompts = self._load_prompt_file(prompts_path)
+        # Load prompts from cache or file
+        self.prompts = load_prompts(prompts_path)
         
         if not self.prompts:
             raise ConfigError(f"No prompt templates found for {self.module_name} module at {prompts_path}")
+        
+        # Required templates - validated here so bad configs fail at startup
+        self.parse_template = self.get_prompt_template("parse_entry_prompt")
+        self.assistant_instructions = self.get_prompt_template("assistant_instructions")
+        
+        # Pre-split the entry prompt around the entry text so each request
+        # only joins strings instead of re-parsing the format placeholders
+        self._entry_template_parts = self._split_entry_template(self.parse_template)
+        self._rendered_parts = (None, None)
+        
+        # Assistant and thread IDs, looked up on the first request
+        self._assistant_id = None
+        self._thread_id = None
     
-    def _load_prompt_file(self, prompts_path: Path) -> Dict[str, Any]:
+    @staticmethod
+    def clear_cache():
+        """
+        Clear all cached configurations and prompts.
+        Useful when configuration files have been updated.
         """
-        Load prompts from a specific file.
+        _load_config_cached.cache_clear()
+        clear_prompts_cache()
+        # The shared adapter holds the old config and prompts, so drop it too
+        _get_agenda_adapter.cache_clear()
+        logger.debug("Cleared all agenda adapter caches")
+    
+    def invalidate_ids(self) -> None:
+        """
+        Forget the cached assistant and thread IDs.
+        
+        The next request looks both up again, which recovers from an
+        assistant or thread that was deleted on the OpenAI side.
+        """
+        self._assistant_id = None
+        self._thread_id = None
+    
+    @staticmethod
+    def _split_entry_template(template: Optional[str]) -> Optional[Tuple[str, ...]]:
+        """
+        Split the entry prompt template around its {entry_content} fields.
         
         Args:
-            prompts_path: Path to the prompts file
+            template: The parse_entry_prompt template text
             
         Returns:
-            Dict: Prompts dictionary
-            
-        Raises:
-            ConfigError: If the prompts file is missing or invalid
+            Tuple: Template pieces between the entry fields, or None if the
+            template uses fields other than entry_content, current_date and
+            current_time and has to go through the generic formatter
         """
-        if not prompts_path.exists():
-            raise ConfigError(f"Prompts file not found: {prompts_path}")
-            
+        if not template:
+            return None
         try:
-            with open(prompts_path, "r", encoding="utf-8") as f:
-                prompts_data = yaml.safe_load(f)
-                prompts = prompts_data.get('prompts', {})
-                if not prompts:
-                    raise ConfigError(f"No prompts found in file: {prompts_path}")
-                return prompts
-        except Exception as e:
-            raise ConfigError(f"Error loading prompts file {prompts_path}: {e}")
+            fields = [field for _, field, _, _ in string.Formatter().parse(template) if field is not None]
+        except ValueError:
+            return None
+        if not set(fields) <= {"entry_content", "current_date", "current_time"}:
+            return None
+        
+        parts = tuple(template.split("{entry_content}"))
+        if len(parts) - 1 != fields.count("entry_content"):
+            return None
+        return parts
+    
+    def _render_entry_prompt(self, entry_content: str, current_date: str, current_time: str) -> str:
+        """
+        Render the entry prompt from the pre-split template.
+        
+        The pieces around the entry text are formatted once per distinct
+        timestamp and reused until it changes.
+        
+        Args:
+            entry_content: The agenda entry text
+            current_date: Current date as YYYY-MM-DD
+            current_time: Current time as HH:MM:SS
+            
+        Returns:
+            str: The formatted prompt
+        """
+        key = (current_date, current_time)
+        cached_key, parts = self._rendered_parts
+        if cached_key != key:
+            parts = [
+                part.format(current_date=current_date, current_time=current_time)
+                for part in self._entry_template_parts
+            ]
+            # Stored as one tuple so concurrent callers never see a mismatch
+            self._rendered_parts = (key, parts)
+        return entry_content.join(parts)
     
     def get_prompt_template(self, prompt_name: str) -> str:
         """
@@ -131,22 +214,18 @@ class agendaAssistantAdapter:
         Raises:
             ConfigError: If the prompt template is not found
         """
-        prompt_data = self.prompts.get(prompt_name)
-        if not prompt_data:
-            raise ConfigError(f"Prompt '{prompt_name}' not found in {self.module_name} prompts")
-
-        template = prompt_data.get("template")
+        template = self.prompts.get(prompt_name)
         if not template:
-            raise ConfigError(f"Template not found for prompt '{prompt_name}'")
-
+            raise ConfigError(f"Prompt '{prompt_name}' not found in {self.module_name} prompts")
         return template
     
-    def process_agenda_entry(self, entry_content: str) -> str:
+    def process_agenda_entry(self, entry_content: str, thread_id: Optional[str] = None) -> str:
         """
         Process a agenda entry using the OpenAI assistant.
         
         Args:
             entry_content: The agenda entry text to process
+            thread_id: Optional thread ID to reuse instead of looking one up
             
         Returns:
             str: The assistant's structured response
@@ -156,36 +235,52 @@ class agendaAssistantAdapter:
             ConfigError: If required configuration is missing
         """
         try:
-            # Get prompt template and instructions - no defaults, must exist
-            prompt_template = self.get_prompt_template("parse_entry_prompt")
-            assistant_instructions = self.get_prompt_template("assistant_instructions")
-            
             # Set up template variables
-            now = datetime.now()
+            current_date, current_time = format_now()
             template_vars = {
                 "entry_content": entry_content,
-                "current_date": now.strftime("%Y-%m-%d"),
-                "current_time": now.strftime("%H:%M:%S")
+                "current_date": current_date,
+                "current_time": current_time
             }
             
-            # Update client instructions
-            self.client.instructions = assistant_instructions
+            # Update client instructions only when they differ
+            if self.client.instructions != self.assistant_instructions:
+                self.client.instructions = self.assistant_instructions
             
-            # Always verify assistant and thread before processing
-            assistant_id, was_created = self.client.get_or_create_assistant()
-            thread_id = self.client.get_or_create_thread()
+            # Look up the assistant and thread once, then reuse them
+            assistant_id = self._assistant_id
+            if assistant_id is None:
+                assistant_id, was_created = self.client.get_or_create_assistant()
+                self._assistant_id = assistant_id
+                logger.debug("Using assistant ID: %s (newly created: %s)", assistant_id, was_created)
+            if not thread_id:
+                thread_id = self._thread_id
+                if thread_id is None:
+                    thread_id = self.client.get_or_create_thread()
+                    self._thread_id = thread_id
             
-            logger.info(f"Using assistant ID: {assistant_id} (newly created: {was_created})")
-            logger.info(f"Using thread ID: {thread_id}")
+            logger.debug("Using thread ID: %s", thread_id)
             
             # Process with the client
-            response = self.client.process_with_prompt_template(
-                input_text=entry_content,
-                prompt_template=prompt_template,
-                template_vars=template_vars,
+            if self._entry_template_parts is None:
+                return self.client.process_with_prompt_template(
+                    input_text=entry_content,
+                    prompt_template=self.parse_template,
+                    template_vars=template_vars,
+                    assistant_id=assistant_id,
+                    thread_id=thread_id
+                )
+            
+            prompt = self._render_entry_prompt(
+                entry_content, template_vars["current_date"], template_vars["current_time"]
+            )
+            response = self.client.run_assistant(
+                prompt=prompt,
                 assistant_id=assistant_id,
                 thread_id=thread_id
             )
+            if not response:
+                raise RunError("No assistant response received")
             
             return response
             
@@ -194,12 +289,33 @@ class agendaAssistantAdapter:
             logger.error(f"Configuration error: {e}")
             raise
         except Exception as e:
+            self.invalidate_ids()
             error_msg = f"Error processing agenda entry: {e}"
             logger.error(error_msg)
             raise AssistantClientError(error_msg)
 
 
-def process_with_agenda_assistant(entry_content: str) -> str:
+@functools.lru_cache(maxsize=1)
+def _get_agenda_adapter(client: Optional[OpenAIAssistantClient] = None) -> agendaAssistantAdapter:
+    """
+    Get the shared agenda adapter for a client.
+    
+    The adapter is built once and reused while callers keep passing the same
+    client (or none). agendaAssistantAdapter.clear_cache() drops it.
+    
+    Args:
+        client: Optional pre-configured OpenAI Assistant Client
+        
+    Returns:
+        agendaAssistantAdapter: The shared adapter
+    """
+    return agendaAssistantAdapter(client=client)
+
+def process_with_agenda_assistant(
+    entry_content: str,
+    client: Optional[OpenAIAssistantClient] = None,
+    thread_id: Optional[str] = None
+) -> str:
     """
     Process a agenda entry using a agenda assistant.
     
@@ -208,6 +324,8 @@ def process_with_agenda_assistant(entry_content: str) -> str:
     
     Args:
         entry_content: The agenda entry text to process
+        client: Optional pre-configured OpenAI Assistant Client to reuse
+        thread_id: Optional thread ID to reuse for this entry
         
     Returns:
         str: The assistant's structured response
@@ -216,5 +334,4 @@ def process_with_agenda_assistant(entry_content: str) -> str:
         ConfigError: If required configuration is missing
         AssistantClientError: If processing fails
     """
-    adapter = agendaAssistantAdapter()
-    return adapter.process_agenda_entry(entry_content) 
\ No newline at end of file
+    return _get_agenda_adapter(client).process_agenda_entry(entry_content, thread_id=thread_id)
@@ -5,34 +5,83 @@ This module provides a specialized interface for text classification
 using the OpenAI Assistant Client.
 """
 
+import functools
+import itertools
+import json
+import logging
+import threading
 from pathlib import Path
 import time
-from typing import Dict, Any, Optional, List, Union, Literal
+from typing import Dict, Any, Optional, List, Sequence, Tuple, Union, Literal
 
 from jassist.logger_utils.logger_utils import setup_logger
 from jassist.api_assistants_cliente.api_assistants_cliente import OpenAIAssistantClient
 from jassist.api_assistants_cliente.config_manager import load_assistant_config
 from jassist.api_assistants_cliente.exceptions import AssistantClientError, ConfigError
 from jassist.utils.path_utils import resolve_path
+from jassist.api_assistants_cliente.adapters._prompts import load_prompts, clear_prompts_cache, file_signature
 
 # Get the script directory
 SCRIPT_DIR = Path(__file__).resolve().parent
+_DEFAULT_PROMPTS_PATH = resolve_path("prompts.yaml", resolve_path("../classification/config", SCRIPT_DIR))
 logger = setup_logger("classification_adapter", module="api_assistants_cliente")
 
-# Global cache for prompts and configurations
-_CONFIG_CACHE = {}
-_PROMPTS_CACHE = {}
+# Serializes config cache misses so concurrent adapters load a file only once
+_CONFIG_LOCK = threading.Lock()
+
+@functools.lru_cache(maxsize=32)
+def _load_config_cached(config_file: Optional[str], signature: Optional[Tuple[int, int]]) -> Dict[str, Any]:
+    """
+    Load the classification assistant configuration.
+    
+    The file's modification time and size are part of the cache key, so an
+    edited config misses the cache and its old entry ages out of the LRU.
+    
+    Args:
+        config_file: Optional path to a specific config file
+        signature: The config file's (modification time, size), if there is a file
+        
+    Returns:
+        Dict: Configuration dictionary
+    """
+    logger.debug("Caching configuration for %s", config_file or "classification")
+    return load_assistant_config(
+        module_name="classification",
+        assistant_name="Classification Assistant",
+        config_file=config_file
+    )
+
+# Optional faster JSON parser for batch responses
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Maximum number of texts sent to the assistant in one batch request. Larger
+# batches risk responses that are truncated by the model's output limit.
+MAX_BATCH_SIZE = 20
 
 # Persistent thread key for maintaining conversation context across multiple
 # classification requests. This improves classification consistency and reduces
 # token usage by leveraging previous context.
 PERSISTENT_THREAD_KEY = "persistent"
 
+# Numbers the keys of forced new threads; next() on it is atomic under the GIL
+_FORCE_NEW_COUNTER = itertools.count()
+
 class ClassificationAdapter:
     """
     Adapter for using the OpenAI Assistant Client with text classification.
     """
     
+    __slots__ = (
+        "module_name", "config", "client", "prompts", "parse_template",
+        "assistant_instructions", "batch_template", "_assistant_id", "_thread_id"
+    )
+    
     def __init__(
         self,
         client: Optional[OpenAIAssistantClient] = None,
@@ -55,31 +104,21 @@ class ClassificationAdapter:
         # Module name for this adapter
         self.module_name = "classification"
         
-        # Resolve prompts file path if provided
-        self.prompts_key = None
-        if prompts_file:
-            self.prompts_key = str(prompts_file)
-        
         # Load configuration
         self.config = None
-        config_key = f"{self.module_name}_{config_file}" if config_file else self.module_name
-        
         if not client:
-            # Try to get config from cache first
-            if use_cache and config_key in _CONFIG_CACHE:
-                logger.debug(f"Using cached configuration for {config_key}")
-                self.config = _CONFIG_CACHE[config_key]
+            if use_cache:
+                config_signature = file_signature(config_file)
+                with _CONFIG_LOCK:
+                    self.config = _load_config_cached(
+                        str(config_file) if config_file else None, config_signature
+                    )
             else:
-                # Load configuration if not in cache
                 self.config = load_assistant_config(
                     module_name=self.module_name,
                     assistant_name="Classification Assistant",
                     config_file=config_file
                 )
-                # Cache the configuration
-                if use_cache:
-                    _CONFIG_CACHE[config_key] = self.config
-                    logger.debug(f"Cached configuration for {config_key}")
             
         # Create or use the provided client
         if client:
@@ -96,22 +135,21 @@ class ClassificationAdapter:
         if prompts_file:
             prompts_path = prompts_file
         else:
-            # Find the module's prompts file
-            module_dir = resolve_path("../classification/config", SCRIPT_DIR)
-            prompts_path = resolve_path("prompts.yaml", module_dir)
-            self.prompts_key = str(prompts_path)
+            prompts_path = _DEFAULT_PROMPTS_PATH
         
         # Load prompts from cache or file
-        if use_cache and self.prompts_key in _PROMPTS_CACHE:
-            logger.debug(f"Using cached prompts from {self.prompts_key}")
-            self.prompts = _PROMPTS_CACHE[self.prompts_key]
-        else:
-            # Load prompts from the file
-            self.prompts = self._load_prompt_file(prompts_path)
-            # Cache the prompts
-            if use_cache:
-                _PROMPTS_CACHE[self.prompts_key] = self.prompts
-                logger.debug(f"Cached prompts from {self.prompts_key}")
+        self.prompts = load_prompts(prompts_path, use_cache=use_cache)
+        
+        # Required templates - validated here so bad configs fail at startup
+        self.parse_template = self.get_prompt_template("parse_entry_prompt")
+        self.assistant_instructions = self.get_prompt_template("assistant_instructions_json")
+        
+        # Optional - without it classify_batch classifies texts one by one
+        self.batch_template = self.prompts.get("parse_batch_prompt")
+        
+        # Assistant and persistent thread IDs, looked up on the first request
+        self._assistant_id = None
+        self._thread_id = None
     
     @staticmethod
     def clear_cache():
@@ -119,38 +157,73 @@ class ClassificationAdapter:
         Clear all cached configurations and prompts.
         Useful when configuration files have been updated.
         """
-        global _CONFIG_CACHE, _PROMPTS_CACHE
-        _CONFIG_CACHE.clear()
-        _PROMPTS_CACHE.clear()
+        _load_config_cached.cache_clear()
+        clear_prompts_cache()
         logger.debug("Cleared all classification adapter caches")
     
-    def _load_prompt_file(self, prompts_path: Path) -> Dict[str, Any]:
+    def invalidate_ids(self) -> None:
         """
-        Load prompts from a specific file.
+        Forget the cached assistant and persistent thread IDs.
+        
+        The next request looks both up again, which recovers from an
+        assistant or thread that was deleted on the OpenAI side.
+        """
+        self._assistant_id = None
+        self._thread_id = None
+    
+    def _get_assistant_id(self) -> str:
+        """
+        Get the assistant ID, looking it up once and then reusing it.
+        
+        Returns:
+            str: Assistant ID
+        """
+        assistant_id = self._assistant_id
+        if assistant_id is None:
+            assistant_id, _ = self.client.get_or_create_assistant()
+            self._assistant_id = assistant_id
+        return assistant_id
+    
+    def _get_ids(self, force_new_thread: bool = False) -> Tuple[str, str]:
+        """
+        Get the assistant and thread IDs for a request.
         
         Args:
-            prompts_path: Path to the prompts file
+            force_new_thread: Force creation of a new thread instead of reusing
             
         Returns:
-            Dict: Prompts dictionary
-            
-        Raises:
-            ConfigError: If the prompts file is missing or invalid
+            Tuple: (assistant ID, thread ID)
         """
-        import yaml
+        assistant_id = self._get_assistant_id()
+        
+        # Get thread ID - either create new or use persistent thread
+        thread_id = None
         
-        if not prompts_path.exists():
-            raise ConfigError(f"Prompts file not found: {prompts_path}")
+        if force_new_thread:
+            # Use a unique thread key to force creation of a new thread
+            thread_key = f"new_{next(_FORCE_NEW_COUNTER)}"
+            logger.debug("Forcing new thread with key: %s", thread_key)
             
-        try:
-            with open(prompts_path, "r", encoding="utf-8") as f:
-                prompts_data = yaml.safe_load(f)
-                prompts = prompts_data.get('prompts', {})
-                if not prompts:
-                    raise ConfigError(f"No prompts found in file: {prompts_path}")
-                return prompts
-        except Exception as e:
-            raise ConfigError(f"Error loading prompts file {prompts_path}: {e}")
+            # Create a temporary thread (don't save to config)
+            thread_id = self.client.get_or_create_thread(
+                thread_key=thread_key, 
+                save_to_config=False
+            )
+        else:
+            # Always use the persistent thread key
+            thread_id = self._thread_id
+            if thread_id is None:
+                thread_id = self.client.get_or_create_thread(
+                    thread_key=PERSISTENT_THREAD_KEY,
+                    save_to_config=True  # Ensure it's saved to config
+                )
+                self._thread_id = thread_id
+            logger.debug("Using persistent thread with key: %s", PERSISTENT_THREAD_KEY)
+        
+        logger.debug("Using assistant ID: %s", assistant_id)
+        logger.debug("Using thread ID: %s", thread_id)
+        
+        return assistant_id, thread_id
     
     def get_prompt_template(self, prompt_name: str) -> str:
         """
@@ -165,14 +238,9 @@ class ClassificationAdapter:
         Raises:
             ConfigError: If the prompt template is not found
         """
-        prompt_data = self.prompts.get(prompt_name)
-        if not prompt_data:
-            raise ConfigError(f"Prompt '{prompt_name}' not found in {self.module_name} prompts")
-
-        template = prompt_data.get("template")
+        template = self.prompts.get(prompt_name)
         if not template:
-            raise ConfigError(f"Template not found for prompt '{prompt_name}'")
-
+            raise ConfigError(f"Prompt '{prompt_name}' not found in {self.module_name} prompts")
         return template
     
     def classify_text(
@@ -194,79 +262,211 @@ class ClassificationAdapter:
             AssistantClientError: If processing fails
             ConfigError: If required configuration is missing
         """
-        start_time = time.time()
+        # Extract text content if input is a dictionary
+        if isinstance(text, dict):
+            text = text.get("text", "")
+        return self._classify_content(text, force_new_thread=force_new_thread)
+    
+    def _classify_content(self, content: str, force_new_thread: bool = False) -> str:
+        """
+        Classify plain text content using the OpenAI assistant.
         
-        try:
-            # Extract text content if input is a dictionary
-            if isinstance(text, dict):
-                content = text.get("text", "")
-            else:
-                content = text
-                
-            # Get prompt templates
-            parse_prompt = self.get_prompt_template("parse_entry_prompt")
-            
-            # Always use the JSON instructions template
-            assistant_instructions = self.get_prompt_template("assistant_instructions_json")
+        Callers that already hold a string, such as batch loops, can use this
+        directly and skip the input type check in classify_text.
+        
+        Args:
+            content: The text to classify
+            force_new_thread: Force creation of a new thread instead of reusing
             
-            # Set up template variables
-            template_vars = {
-                "entry_content": content
-            }
+        Returns:
+            str: The classification result
             
-            # Update client instructions
-            self.client.instructions = assistant_instructions
+        Raises:
+            AssistantClientError: If processing fails
+            ConfigError: If required configuration is missing
+        """
+        return self._classify_contents([content], force_new_thread=force_new_thread)[0]
+    
+    def classify_texts(
+        self,
+        texts: Sequence[Union[str, Dict[str, Any]]],
+        force_new_thread: bool = False
+    ) -> List[str]:
+        """
+        Classify several texts one after another on the same thread.
+        
+        The instructions, assistant and thread are set up once and every
+        text is then sent as its own message. With force_new_thread, all
+        texts share one new thread.
+        
+        Args:
+            texts: The texts to classify, or dicts containing the text
+            force_new_thread: Force creation of a new thread instead of reusing
             
-            # Get or create assistant
-            assistant_id, _ = self.client.get_or_create_assistant()
+        Returns:
+            List[str]: One classification result per input text
             
-            # Get thread ID - either create new or use persistent thread
-            thread_id = None
+        Raises:
+            AssistantClientError: If processing fails; its partial_results
+                attribute holds the results of the texts classified before
+                the failure
+            ConfigError: If required configuration is missing
+        """
+        # Extract text content from dictionaries once, before the request loop
+        contents = [text.get("text", "") if isinstance(text, dict) else text for text in texts]
+        return self._classify_contents(contents, force_new_thread=force_new_thread)
+    
+    def _classify_contents(self, contents: Sequence[str], force_new_thread: bool = False) -> List[str]:
+        """
+        Classify several plain texts one after another on the same thread.
+        
+        Args:
+            contents: The texts to classify
+            force_new_thread: Force creation of a new thread instead of reusing
             
-            if force_new_thread:
-                # Use a unique thread key to force creation of a new thread
-                thread_key = f"new_{int(time.time())}"
-                logger.debug(f"Forcing new thread with key: {thread_key}")
-                
-                # Create a temporary thread (don't save to config)
-                thread_id = self.client.get_or_create_thread(
-                    thread_key=thread_key, 
-                    save_to_config=False
-                )
-            else:
-                # Always use the persistent thread key
-                thread_id = self.client.get_or_create_thread(
-                    thread_key=PERSISTENT_THREAD_KEY,
-                    save_to_config=True  # Ensure it's saved to config
-                )
-                logger.debug(f"Using persistent thread with key: {PERSISTENT_THREAD_KEY}")
+        Returns:
+            List[str]: One classification result per input text
             
-            logger.info(f"Using assistant ID: {assistant_id}")
-            logger.info(f"Using thread ID: {thread_id}")
+        Raises:
+            AssistantClientError: If processing fails; its partial_results
+                attribute holds the results of the texts classified before
+                the failure
+            ConfigError: If required configuration is missing
+        """
+        results = []
+        start_time = time.perf_counter()
+        # Per-text timing is only measured when it will be logged
+        timing = logger.isEnabledFor(logging.INFO)
+        
+        try:
+            # Update client instructions only when they differ
+            if self.client.instructions != self.assistant_instructions:
+                self.client.instructions = self.assistant_instructions
             
-            # Process with the client
-            response = self.client.process_with_prompt_template(
-                input_text=content,
-                prompt_template=parse_prompt,
-                template_vars=template_vars,
-                assistant_id=assistant_id,
-                thread_id=thread_id
-            )
+            assistant_id, thread_id = self._get_ids(force_new_thread)
             
-            if not response:
-                raise AssistantClientError("No response from classification assistant")
+            for text in contents:
+                if timing:
+                    text_start = time.perf_counter()
+                
+                # Process with the client
+                response = self.client.process_with_prompt_template(
+                    input_text=text,
+                    prompt_template=self.parse_template,
+                    template_vars={"entry_content": text},
+                    assistant_id=assistant_id,
+                    thread_id=thread_id
+                )
+                
+                if not response:
+                    raise AssistantClientError("No response from classification assistant")
+                
+                if timing:
+                    logger.info("Classification successful: %.100s... (completed in %.2fs)",
+                                response, time.perf_counter() - text_start)
+                results.append(response)
             
-            elapsed_time = time.time() - start_time
-            logger.info(f"Classification successful: {response[:100]}... (completed in {elapsed_time:.2f}s)")
-            return response
+            return results
             
         except ConfigError as e:
             # Re-raise configuration errors
-            elapsed_time = time.time() - start_time
+            elapsed_time = time.perf_counter() - start_time
             logger.error(f"Configuration error: {e} (after {elapsed_time:.2f}s)")
             raise
         except Exception as e:
-            elapsed_time = time.time() - start_time
+            self.invalidate_ids()
+            elapsed_time = time.perf_counter() - start_time
             error_msg = f"Error during classification: {e} (after {elapsed_time:.2f}s)"
             logger.error(error_msg)
-            raise AssistantClientError(error_msg)
\ No newline at end of file
+            error = AssistantClientError(error_msg)
+            error.partial_results = results
+            raise error
+    
+    def classify_batch(self, texts: List[str]) -> List[str]:
+        """
+        Classify several texts with one assistant request per batch.
+        
+        Texts are sent in groups of up to MAX_BATCH_SIZE as a JSON list, and
+        the assistant answers with a JSON object whose "results" list holds
+        the classification objects in the same order (the assistant's JSON
+        response format cannot return a bare list). If the prompts have no
+        parse_batch_prompt, or a response has no results list of the
+        expected length (for example because it was truncated), that group
+        is classified one text at a time.
+        
+        Args:
+            texts: The texts to classify
+            
+        Returns:
+            List[str]: One classification result (JSON text) per input text
+            
+        Raises:
+            AssistantClientError: If processing fails
+            ConfigError: If required configuration is missing
+        """
+        if not self.batch_template or len(texts) <= 1:
+            return self._classify_contents(texts)
+        
+        results = []
+        for start in range(0, len(texts), MAX_BATCH_SIZE):
+            batch = texts[start:start + MAX_BATCH_SIZE]
+            batch_results = self._classify_batch_request(batch)
+            if batch_results is None:
+                logger.warning("Batch classification response unusable, classifying %s texts individually", len(batch))
+                batch_results = self._classify_contents(batch)
+            results.extend(batch_results)
+        
+        return results
+    
+    def _classify_batch_request(self, batch: List[str]) -> Optional[List[str]]:
+        """
+        Send one batch of texts to the assistant.
+        
+        Batches run on a new unsaved thread, so the batch prompt and its
+        JSON reply never enter the persistent thread that single-text
+        classifications share.
+        
+        Args:
+            batch: The texts to classify
+            
+        Returns:
+            List[str]: One classification result per text, or None if the
+            response could not be matched to the batch
+        """
+        timing = logger.isEnabledFor(logging.INFO)
+        start_time = time.perf_counter() if timing else 0.0
+        entries_json = json.dumps(batch, ensure_ascii=False)
+        
+        try:
+            if self.client.instructions != self.assistant_instructions:
+                self.client.instructions = self.assistant_instructions
+            assistant_id = self._get_assistant_id()
+            
+            response = self.client.process_with_prompt_template(
+                input_text=entries_json,
+                prompt_template=self.batch_template,
+                template_vars={"entries_json": entries_json, "entry_count": len(batch)},
+                assistant_id=assistant_id,
+                ephemeral_thread=True
+            )
+        except ConfigError:
+            raise
+        except Exception as e:
+            self.invalidate_ids()
+            raise AssistantClientError(f"Error during batch classification: {e}")
+        
+        if not response:
+            return None
+        
+        # Tolerate text or code fences around the JSON object
+        start, end = response.find("{"), response.rfind("}")
+        try:
+            items = _json_loads(response[start:end + 1]).get("results") if start != -1 and end > start else None
+        except (ValueError, AttributeError):
+            items = None
+        if not isinstance(items, list) or len(items) != len(batch):
+            return None
+        
+        if timing:
+            logger.info("Batch classification of %s texts completed in %.2fs", len(batch), time.perf_counter() - start_time)
+        return [json.dumps(item, ensure_ascii=False) for item in items]
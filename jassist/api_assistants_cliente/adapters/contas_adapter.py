@@ -5,23 +5,41 @@ This module provides a specialized interface for financial transactions processi
 using the OpenAI Assistant Client.
 """
 
-from datetime import datetime
+import logging
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple
-import yaml
 
 from jassist.logger_utils.logger_utils import setup_logger
 from ..api_assistants_cliente import OpenAIAssistantClient
 from ..config_manager import load_assistant_config
 from ..exceptions import AssistantClientError, ConfigError
+from ._prompts import load_prompts, entry_template_vars
 
 logger = setup_logger("contas_adapter", module="api_assistants_cliente")
 
+# Default file locations, resolved once at import
+_JASSIST_DIR = Path(__file__).resolve().parent.parent.parent.parent
+_DEFAULT_CONFIG_PATH = _JASSIST_DIR / "jassist" / "contas" / "config" / "contas_assistant_config.json"
+_DEFAULT_PROMPTS_PATH = _JASSIST_DIR / "jassist" / "contas" / "config" / "prompts.yaml"
+
+# Shared adapter used by process_with_contas_assistant
+_ADAPTER_SINGLETON: Optional["ContasAssistantAdapter"] = None
+_ADAPTER_LOCK = threading.Lock()
+
+# Clients shared by adapters built for the same module and config file
+_CLIENT_CACHE: Dict[Tuple[str, str], OpenAIAssistantClient] = {}
+_CLIENT_LOCK = threading.Lock()
+
 class ContasAssistantAdapter:
     """
     Adapter for using the OpenAI Assistant Client with financial transaction processing.
     """
     
+    __slots__ = (
+        "module_name", "client", "prompts", "parse_template", "assistant_instructions"
+    )
+    
     def __init__(
         self,
         client: Optional[OpenAIAssistantClient] = None,
@@ -48,75 +66,65 @@ class ContasAssistantAdapter:
         else:
             # Default config file path - use contas_assistant_config.json in the contas module
             if config_file is None:
-                jassist_dir = Path(__file__).resolve().parent.parent.parent.parent
-                config_file = jassist_dir / "jassist" / "contas" / "config" / "contas_assistant_config.json"
-                logger.info(f"Using contas module config file: {config_file}")
-            
-            # Load configuration
-            config = load_assistant_config(
-                module_name=self.module_name,
-                assistant_name="Assistente de Contas",
-                config_file=config_file
-            )
-            
-            if not config:
-                raise ConfigError(f"No configuration found for {self.module_name} module.")
-            
-            # Create client with contas-specific settings
-            self.client = OpenAIAssistantClient(
-                config=config,
-                assistant_name="Assistente de Contas",
-                module_name=self.module_name
-            )
+                config_file = _DEFAULT_CONFIG_PATH
+                logger.debug("Using contas module config file: %s", config_file)
+            
+            # Reuse the client built for this config file, if any
+            cache_key = (self.module_name, str(config_file))
+            client = _CLIENT_CACHE.get(cache_key)
+            if client is None:
+                with _CLIENT_LOCK:
+                    client = _CLIENT_CACHE.get(cache_key)
+                    if client is None:
+                        # Load configuration
+                        config = load_assistant_config(
+                            module_name=self.module_name,
+                            assistant_name="Assistente de Contas",
+                            config_file=config_file
+                        )
+                        
+                        if not config:
+                            raise ConfigError(f"No configuration found for {self.module_name} module.")
+                        
+                        # Create client with contas-specific settings
+                        client = _CLIENT_CACHE[cache_key] = OpenAIAssistantClient(
+                            config=config,
+                            assistant_name="Assistente de Contas",
+                            module_name=self.module_name
+                        )
+                        logger.debug("Cached contas client for %s", config_file)
+            self.client = client
         
         # Load prompts - use either the provided file or the module's config file
         if prompts_file:
             prompts_path = prompts_file
         else:
-            # Use the module's config path - FIXED PATH CONSTRUCTION
-            # Get the jassist directory
-            jassist_dir = Path(__file__).resolve().parent.parent.parent.parent
-            
-            # Log the path to help with debugging
-            logger.info(f"jassist directory: {jassist_dir}")
-            
-            # Construct path to the contas module's prompts file in the jassist directory
-            prompts_path = jassist_dir / "jassist" / "contas" / "config" / "prompts.yaml"
-            
-            # Log the final path to help with debugging
-            logger.info(f"Using prompts path: {prompts_path}")
+            # Use the contas module's prompts file in the jassist directory
+            prompts_path = _DEFAULT_PROMPTS_PATH
+        
+        # Log the paths to help with debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("jassist directory: %s, prompts path: %s", _JASSIST_DIR, prompts_path)
         
-        # Load prompts from the file
-        self.prompts = self._load_prompt_file(prompts_path)
+        # Load prompts through the shared cache
+        self.prompts = load_prompts(prompts_path)
         
         if not self.prompts:
             raise ConfigError(f"No prompt templates found for {self.module_name} module at {prompts_path}")
+        
+        # Resolve the templates used per entry once - no defaults, must exist
+        self.parse_template = self.get_prompt_template("parse_entry_prompt")
+        self.assistant_instructions = self.get_prompt_template("assistant_instructions")
     
-    def _load_prompt_file(self, prompts_path: Path) -> Dict[str, Any]:
+    @classmethod
+    def clear_client_cache(cls) -> None:
         """
-        Load prompts from a specific file.
-        
-        Args:
-            prompts_path: Path to the prompts file
-            
-        Returns:
-            Dict: Prompts dictionary
-            
-        Raises:
-            ConfigError: If the prompts file is missing or invalid
+        Clear the shared clients so new adapters rebuild them.
+        Useful when the configuration file has been updated.
         """
-        if not prompts_path.exists():
-            raise ConfigError(f"Prompts file not found: {prompts_path}")
-            
-        try:
-            with open(prompts_path, "r", encoding="utf-8") as f:
-                prompts_data = yaml.safe_load(f)
-                prompts = prompts_data.get('prompts', {})
-                if not prompts:
-                    raise ConfigError(f"No prompts found in file: {prompts_path}")
-                return prompts
-        except Exception as e:
-            raise ConfigError(f"Error loading prompts file {prompts_path}: {e}")
+        with _CLIENT_LOCK:
+            _CLIENT_CACHE.clear()
+        logger.debug("Cleared %s client cache", cls.__name__)
     
     def get_prompt_template(self, prompt_name: str) -> str:
         """
@@ -131,14 +139,9 @@ class ContasAssistantAdapter:
         Raises:
             ConfigError: If the prompt template is not found
         """
-        prompt_data = self.prompts.get(prompt_name)
-        if not prompt_data:
-            raise ConfigError(f"Prompt '{prompt_name}' not found in {self.module_name} prompts")
-
-        template = prompt_data.get("template")
+        template = self.prompts.get(prompt_name)
         if not template:
-            raise ConfigError(f"Template not found for prompt '{prompt_name}'")
-
+            raise ConfigError(f"Prompt '{prompt_name}' not found in {self.module_name} prompts")
         return template
     
     def process_transaction_entry(self, entry_content: str) -> str:
@@ -156,32 +159,25 @@ class ContasAssistantAdapter:
             ConfigError: If required configuration is missing
         """
         try:
-            # Get prompt template and instructions - no defaults, must exist
-            prompt_template = self.get_prompt_template("parse_entry_prompt")
-            assistant_instructions = self.get_prompt_template("assistant_instructions")
-            
-            # Set up template variables
-            now = datetime.now()
-            template_vars = {
-                "entry_content": entry_content,
-                "current_date": now.strftime("%Y-%m-%d"),
-                "current_time": now.strftime("%H:%M:%S")
-            }
+            # Set up template variables (a per-thread dict reused across entries)
+            template_vars = entry_template_vars(entry_content)
             
-            # Update client instructions
-            self.client.instructions = assistant_instructions
+            # Update client instructions only when they differ
+            if self.client.instructions != self.assistant_instructions:
+                self.client.instructions = self.assistant_instructions
             
             # Always verify assistant and thread before processing
             assistant_id, was_created = self.client.get_or_create_assistant()
             thread_id = self.client.get_or_create_thread()
             
-            logger.info(f"Using assistant ID: {assistant_id} (newly created: {was_created})")
-            logger.info(f"Using thread ID: {thread_id}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Using assistant ID: %s (newly created: %s), thread ID: %s",
+                             assistant_id, was_created, thread_id)
             
             # Process with the client
             response = self.client.process_with_prompt_template(
                 input_text=entry_content,
-                prompt_template=prompt_template,
+                prompt_template=self.parse_template,
                 template_vars=template_vars,
                 assistant_id=assistant_id,
                 thread_id=thread_id
@@ -216,5 +212,25 @@ def process_with_contas_assistant(entry_content: str) -> str:
         ConfigError: If required configuration is missing
         AssistantClientError: If processing fails
     """
-    adapter = ContasAssistantAdapter()
+    global _ADAPTER_SINGLETON
+    
+    adapter = _ADAPTER_SINGLETON
+    if adapter is None:
+        with _ADAPTER_LOCK:
+            adapter = _ADAPTER_SINGLETON
+            if adapter is None:
+                adapter = _ADAPTER_SINGLETON = ContasAssistantAdapter()
+                logger.debug("Created shared ContasAssistantAdapter instance")
+    
     return adapter.process_transaction_entry(entry_content)
+
+
+def reset_adapter() -> None:
+    """
+    Drop the shared adapter so the next call builds a new one.
+    
+    Useful in tests or after the configuration or prompts have changed.
+    """
+    global _ADAPTER_SINGLETON
+    with _ADAPTER_LOCK:
+        _ADAPTER_SINGLETON = None
@@ -105,11 +105,13 @@ class DiarioAssistantAdapter:
         Raises:
             ConfigError: If the prompts file is missing or invalid
         """
-        if not prompts_path.exists():
+        try:
+            f = open(prompts_path, "r", encoding="utf-8")
+        except FileNotFoundError:
             raise ConfigError(f"Prompts file not found: {prompts_path}")
             
         try:
-            with open(prompts_path, "r", encoding="utf-8") as f:
+            with f:
                 prompts_data = yaml.safe_load(f)
                 prompts = prompts_data.get('prompts', {})
                 if not prompts:
@@ -168,8 +170,9 @@ class DiarioAssistantAdapter:
                 "current_time": now.strftime("%H:%M:%S")
             }
             
-            # Update client instructions
-            self.client.instructions = assistant_instructions
+            # Update client instructions only when they differ
+            if self.client.instructions != assistant_instructions:
+                self.client.instructions = assistant_instructions
             
             # Always verify assistant and thread before processing
             assistant_id, was_created = self.client.get_or_create_assistant()
@@ -217,4 +220,6 @@ def process_with_diario_assistant(entry_content: str) -> str:
         AssistantClientError: If processing fails
     """
     adapter = DiarioAssistantAdapter()
-    return adapter.process_diary_entry(entry_content)
+    # Write the thread IDs this call recorded before the client is dropped
+    with adapter.client:
+        return adapter.process_diary_entry(entry_content)
@@ -5,34 +5,122 @@ This module provides a specialized interface for text summarization
 using the OpenAI Assistant Client.
 """
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import itertools
 from pathlib import Path
+import threading
 import time
-from typing import Dict, Any, Optional, List, Union, Literal
+from typing import Deque, Dict, Any, Optional, List, Set, Tuple, Union, Literal
 
 from jassist.logger_utils.logger_utils import setup_logger
 from jassist.api_assistants_cliente.api_assistants_cliente import OpenAIAssistantClient
 from jassist.api_assistants_cliente.config_manager import load_assistant_config
 from jassist.api_assistants_cliente.exceptions import AssistantClientError, ConfigError
+from jassist.api_assistants_cliente.adapters._prompts import load_prompts, clear_prompts_cache, file_signature
 from jassist.utils.path_utils import resolve_path
 
 # Get the script directory
 SCRIPT_DIR = Path(__file__).resolve().parent
+_DEFAULT_PROMPTS_PATH = resolve_path("prompts.yaml", resolve_path("../summary/config", SCRIPT_DIR))
 logger = setup_logger("sample_adapter", module="api_assistants_cliente")
 
-# Global cache for prompts and configurations
-_CONFIG_CACHE = {}
-_PROMPTS_CACHE = {}
+# Serializes config cache misses so concurrent adapters load a file only once
+_CONFIG_LOCK = threading.Lock()
 
-# Thread pool for reusing threads based on task type
-_THREAD_POOL = {}
+# Idle threads available for reuse, keyed by (assistant ID, task type). Each
+# entry pairs a deque bounded to _MAX_POOL_SIZE with the set of its thread
+# IDs, for constant-time membership checks. A thread is taken out of the
+# pool while a summary runs on it, since runs on one thread cannot overlap.
+_THREAD_POOL: Dict[Tuple[str, str], Tuple[Deque[str], Set[str]]] = {}
 # Maximum number of threads to keep in pool
 _MAX_POOL_SIZE = 3
 
+# Numbers the keys of threads created for the pool, so that concurrent
+# summaries each get a thread of their own
+_POOL_THREAD_COUNTER = itertools.count()
+
+# One lock per pool key so concurrent summaries only contend on the same pool
+_POOL_LOCKS: Dict[Tuple[str, str], threading.Lock] = {}
+_POOL_LOCKS_GUARD = threading.Lock()
+
+def _lock_for(pool_key: Tuple[str, str]) -> threading.Lock:
+    """
+    Get the lock guarding one thread pool entry, creating it on first use.
+    
+    Args:
+        pool_key: The thread pool key (assistant ID, task type)
+        
+    Returns:
+        threading.Lock: Lock for the pool key
+    """
+    lock = _POOL_LOCKS.get(pool_key)
+    if lock is None:
+        with _POOL_LOCKS_GUARD:
+            lock = _POOL_LOCKS.get(pool_key)
+            if lock is None:
+                lock = _POOL_LOCKS[pool_key] = threading.Lock()
+    return lock
+
+@functools.lru_cache(maxsize=32)
+def _load_config_cached(config_file: Optional[str], signature: Optional[Tuple[int, int]]) -> Dict[str, Any]:
+    """
+    Load the summary assistant configuration.
+    
+    The file's modification time and size are part of the cache key, so an
+    edited config misses the cache and its old entry ages out of the LRU.
+    
+    Args:
+        config_file: Optional path to a specific config file
+        signature: The config file's (modification time, size), if there is a file
+        
+    Returns:
+        Dict: Configuration dictionary
+    """
+    logger.debug("Caching configuration for %s", config_file or "summary")
+    return load_assistant_config(
+        module_name="summary",
+        assistant_name="Text Summarizer",
+        config_file=config_file
+    )
+
+# Focus areas used when the caller gives none
+_DEFAULT_FOCUS_AREAS = ("the main points",)
+
+@functools.lru_cache(maxsize=64)
+def _static_template_vars(
+    summary_type: str,
+    target_length: int,
+    focus_key: Tuple[str, ...]
+) -> Tuple[Tuple[str, str], ...]:
+    """
+    Build the template variables that do not depend on the input text.
+    
+    Args:
+        summary_type: Type of summary
+        target_length: Target word count for summary
+        focus_key: Specific areas to focus on, empty for the default
+        
+    Returns:
+        Tuple: (name, value) pairs for summary_type, target_length and focus_areas
+    """
+    return (
+        ("summary_type", summary_type),
+        ("target_length", str(target_length)),
+        ("focus_areas", ", ".join(focus_key or _DEFAULT_FOCUS_AREAS)),
+    )
+
 class SummaryAssistantAdapter:
     """
     Adapter for using the OpenAI Assistant Client with text summarization.
     """
     
+    __slots__ = (
+        "module_name", "use_thread_pool", "config", "client", "prompts",
+        "summarize_template", "assistant_instructions", "_assistant_id"
+    )
+    
     def __init__(
         self,
         client: Optional[OpenAIAssistantClient] = None,
@@ -58,34 +146,25 @@ class SummaryAssistantAdapter:
         self.module_name = "summary"
         self.use_thread_pool = use_thread_pool
         
-        # Resolve prompts file path if provided
-        self.prompts_key = None
-        if prompts_file:
-            self.prompts_key = str(prompts_file)
-        
         # Load configuration
         self.config = None
-        config_key = f"{self.module_name}_{config_file}" if config_file else self.module_name
         
         # Create or use the provided client
         if client:
             self.client = client
         else:
-            # Try to get config from cache first
-            if use_cache and config_key in _CONFIG_CACHE:
-                logger.debug(f"Using cached configuration for {config_key}")
-                config = _CONFIG_CACHE[config_key]
+            if use_cache:
+                config_signature = file_signature(config_file)
+                with _CONFIG_LOCK:
+                    config = _load_config_cached(
+                        str(config_file) if config_file else None, config_signature
+                    )
             else:
-                # Load configuration if not in cache
                 config = load_assistant_config(
                     module_name=self.module_name,
                     assistant_name="Text Summarizer",
                     config_file=config_file
                 )
-                # Cache the configuration
-                if use_cache:
-                    _CONFIG_CACHE[config_key] = config
-                    logger.debug(f"Cached configuration for {config_key}")
             
             # Create client with summary-specific settings
             self.client = OpenAIAssistantClient(
@@ -102,21 +181,17 @@ class SummaryAssistantAdapter:
             prompts_path = prompts_file
         else:
             # Use the module's config path
-            module_dir = resolve_path("../summary/config", SCRIPT_DIR)
-            prompts_path = resolve_path("prompts.yaml", module_dir)
-            self.prompts_key = str(prompts_path)
+            prompts_path = _DEFAULT_PROMPTS_PATH
         
-        # Load prompts from cache or file
-        if use_cache and self.prompts_key in _PROMPTS_CACHE:
-            logger.debug(f"Using cached prompts from {self.prompts_key}")
-            self.prompts = _PROMPTS_CACHE[self.prompts_key]
-        else:
-            # Load prompts from the file
-            self.prompts = self._load_prompt_file(prompts_path)
-            # Cache the prompts
-            if use_cache:
-                _PROMPTS_CACHE[self.prompts_key] = self.prompts
-                logger.debug(f"Cached prompts from {self.prompts_key}")
+        # Load prompts through the shared cache
+        self.prompts = load_prompts(Path(prompts_path), use_cache=use_cache)
+        
+        # Required templates - validated here so bad configs fail at startup
+        self.summarize_template = self.get_prompt_template("summarize_text")
+        self.assistant_instructions = self.get_prompt_template("assistant_instructions")
+        
+        # Assistant ID, looked up on the first request
+        self._assistant_id = None
     
     @staticmethod
     def clear_cache():
@@ -124,11 +199,21 @@ class SummaryAssistantAdapter:
         Clear all cached configurations and prompts.
         Useful when configuration files have been updated.
         """
-        global _CONFIG_CACHE, _PROMPTS_CACHE
-        _CONFIG_CACHE.clear()
-        _PROMPTS_CACHE.clear()
+        _load_config_cached.cache_clear()
+        clear_prompts_cache()
+        # The shared adapters hold the old config and prompts, so drop them too
+        _get_summary_adapter.cache_clear()
         logger.debug("Cleared all summary adapter caches")
     
+    def invalidate_assistant(self) -> None:
+        """
+        Forget the cached assistant ID.
+        
+        The next request looks it up again, which recovers from an assistant
+        that was deleted on the OpenAI side or picks up changed instructions.
+        """
+        self._assistant_id = None
+    
     @staticmethod
     def clear_thread_pool():
         """
@@ -136,12 +221,16 @@ class SummaryAssistantAdapter:
         Useful when thread content might be affecting results.
         """
         global _THREAD_POOL
-        _THREAD_POOL.clear()
+        with _POOL_LOCKS_GUARD:
+            _THREAD_POOL.clear()
         logger.debug("Cleared summary thread pool")
     
     def _get_thread_from_pool(self, task_type: str, assistant_id: str) -> Optional[str]:
         """
-        Get a thread ID from the thread pool for the given task type and assistant.
+        Take an idle thread ID out of the thread pool for the given task type and assistant.
+        
+        The thread stays out of the pool until it is returned with
+        _add_thread_to_pool, so no other summary runs on it meanwhile.
         
         Args:
             task_type: The task type (e.g., "comprehensive", "bullet_points")
@@ -153,25 +242,25 @@ class SummaryAssistantAdapter:
         if not self.use_thread_pool:
             return None
             
-        pool_key = f"{assistant_id}_{task_type}"
-        threads = _THREAD_POOL.get(pool_key, [])
+        pool_key = (assistant_id, task_type)
+        entry = _THREAD_POOL.get(pool_key)
         
-        if threads:
-            # Get the oldest thread (FIFO)
-            thread_id = threads.pop(0)
-            logger.debug(f"Reusing thread {thread_id} from pool for {pool_key}")
-            
-            # Put it back at the end (for round-robin reuse)
-            threads.append(thread_id)
-            _THREAD_POOL[pool_key] = threads
-            
+        if entry and entry[0]:
+            threads, members = entry
+            # Take the thread that has been idle the longest (FIFO)
+            with _lock_for(pool_key):
+                if not threads:
+                    return None
+                thread_id = threads.popleft()
+                members.discard(thread_id)
+            logger.debug("Reusing thread %s from pool for %s", thread_id, pool_key)
             return thread_id
         
         return None
     
     def _add_thread_to_pool(self, thread_id: str, task_type: str, assistant_id: str):
         """
-        Add a thread ID to the thread pool.
+        Add a thread ID to the thread pool, or return one taken from it.
         
         Args:
             thread_id: The thread ID to add
@@ -181,47 +270,23 @@ class SummaryAssistantAdapter:
         if not self.use_thread_pool:
             return
             
-        pool_key = f"{assistant_id}_{task_type}"
-        threads = _THREAD_POOL.get(pool_key, [])
-        
-        # Only add if not already in the pool
-        if thread_id not in threads:
-            threads.append(thread_id)
-            
-            # Limit pool size
-            if len(threads) > _MAX_POOL_SIZE:
-                threads = threads[-_MAX_POOL_SIZE:]
-            
-            _THREAD_POOL[pool_key] = threads
-            logger.debug(f"Added thread {thread_id} to pool for {pool_key}")
-    
-    def _load_prompt_file(self, prompts_path: Path) -> Dict[str, Any]:
-        """
-        Load prompts from a specific file.
-        
-        Args:
-            prompts_path: Path to the prompts file
-            
-        Returns:
-            Dict: Prompts dictionary
+        pool_key = (assistant_id, task_type)
+        with _lock_for(pool_key):
+            entry = _THREAD_POOL.get(pool_key)
+            if entry is None:
+                entry = _THREAD_POOL[pool_key] = (deque(maxlen=_MAX_POOL_SIZE), set())
+            threads, members = entry
             
-        Raises:
-            ConfigError: If the prompts file is missing or invalid
-        """
-        import yaml
-        
-        if not prompts_path.exists():
-            raise ConfigError(f"Prompts file not found: {prompts_path}")
+            # Only add if not already in the pool
+            if thread_id in members:
+                return
             
-        try:
-            with open(prompts_path, "r", encoding="utf-8") as f:
-                prompts_data = yaml.safe_load(f)
-                prompts = prompts_data.get('prompts', {})
-                if not prompts:
-                    raise ConfigError(f"No prompts found in file: {prompts_path}")
-                return prompts
-        except Exception as e:
-            raise ConfigError(f"Error loading prompts file {prompts_path}: {e}")
+            # A full deque drops its oldest thread on append; forget it too
+            if len(threads) == threads.maxlen:
+                members.discard(threads[0])
+            threads.append(thread_id)
+            members.add(thread_id)
+        logger.debug("Added thread %s to pool for %s", thread_id, pool_key)
     
     def get_prompt_template(self, prompt_name: str) -> str:
         """
@@ -236,14 +301,9 @@ class SummaryAssistantAdapter:
         Raises:
             ConfigError: If the prompt template is not found
         """
-        prompt_data = self.prompts.get(prompt_name)
-        if not prompt_data:
-            raise ConfigError(f"Prompt '{prompt_name}' not found in {self.module_name} prompts")
-
-        template = prompt_data.get("template")
+        template = self.prompts.get(prompt_name)
         if not template:
-            raise ConfigError(f"Template not found for prompt '{prompt_name}'")
-
+            raise ConfigError(f"Prompt '{prompt_name}' not found in {self.module_name} prompts")
         return template
     
     def summarize_text(
@@ -271,86 +331,101 @@ class SummaryAssistantAdapter:
             AssistantClientError: If processing fails
             ConfigError: If required configuration is missing
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
-            # Get prompt template - no defaults, must exist
-            prompt_template = self.get_prompt_template("summarize_text")
-            
-            # Get assistant instructions
-            assistant_instructions = self.get_prompt_template("assistant_instructions")
-            
             # Set up template variables
-            template_vars = {
-                "input_text": text,
-                "summary_type": summary_type,
-                "target_length": str(target_length),
-                "focus_areas": ", ".join(focus_areas) if focus_areas else "the main points"
-            }
+            template_vars = dict(
+                _static_template_vars(summary_type, target_length, tuple(focus_areas or ())),
+                input_text=text
+            )
             
-            # Update client instructions
-            self.client.instructions = assistant_instructions
+            # Update client instructions only when they differ
+            if self.client.instructions != self.assistant_instructions:
+                self.client.instructions = self.assistant_instructions
             
-            # Get or create assistant
-            assistant_id, _ = self.client.get_or_create_assistant()
+            # Get or create assistant once, then reuse it
+            assistant_id = self._assistant_id
+            if assistant_id is None:
+                assistant_id, _ = self.client.get_or_create_assistant()
+                self._assistant_id = assistant_id
             
             # Get thread ID - either from pool or create new
             thread_id = None
             thread_key = "default"
             
             if force_new_thread:
-                # Use a unique thread key to force creation of a new thread
-                thread_key = f"new_{int(time.time())}"
-                logger.debug(f"Forcing new thread with key: {thread_key}")
-                
-                # Create a temporary thread (don't save to config)
-                thread_id = self.client.get_or_create_thread(
-                    thread_key=thread_key, 
-                    save_to_config=False
-                )
+                # Leave thread_id unset; the client creates an unsaved thread
+                # in the same request that starts the run
+                logger.debug("Forcing new thread")
             elif self.use_thread_pool:
                 # Try to get a thread from our pool
                 thread_id = self._get_thread_from_pool(summary_type, assistant_id)
-            
-            if not thread_id:
+                
+                if not thread_id:
+                    # No idle thread - create one for this summary; it joins
+                    # the pool once the summary is done
+                    thread_id = self.client.get_or_create_thread(
+                        thread_key=f"pool_{next(_POOL_THREAD_COUNTER)}",
+                        save_to_config=False
+                    )
+            else:
                 # Get or create a thread with the appropriate key
                 thread_id = self.client.get_or_create_thread(thread_key=thread_key)
-                
-                # Add to thread pool if using pool and not forcing new
-                if self.use_thread_pool and not force_new_thread:
-                    self._add_thread_to_pool(thread_id, summary_type, assistant_id)
             
-            logger.info(f"Using assistant ID: {assistant_id}")
-            logger.info(f"Using thread ID: {thread_id}")
+            logger.debug("Using assistant ID: %s", assistant_id)
+            logger.debug("Using thread ID: %s", thread_id)
             
             # Process with the client
             response = self.client.process_with_prompt_template(
                 input_text=text,
-                prompt_template=prompt_template,
+                prompt_template=self.summarize_template,
                 template_vars=template_vars,
                 assistant_id=assistant_id,
-                thread_id=thread_id
+                thread_id=thread_id,
+                ephemeral_thread=force_new_thread
             )
             
             if not response:
                 raise AssistantClientError("No response from summary assistant")
             
-            elapsed_time = time.time() - start_time
-            logger.info(f"Summarization successful: {response[:100]}... (completed in {elapsed_time:.2f}s)")
+            # Return the thread to the pool; threads of failed runs are dropped
+            if self.use_thread_pool and not force_new_thread:
+                self._add_thread_to_pool(thread_id, summary_type, assistant_id)
+            
+            elapsed_time = time.perf_counter() - start_time
+            logger.info("Summarization successful: %.100s... (completed in %.2fs)", response, elapsed_time)
             return response
             
         except ConfigError as e:
             # Re-raise configuration errors
-            elapsed_time = time.time() - start_time
-            logger.error(f"Configuration error: {e} (after {elapsed_time:.2f}s)")
+            elapsed_time = time.perf_counter() - start_time
+            logger.error("Configuration error: %s (after %.2fs)", e, elapsed_time)
             raise
         except Exception as e:
-            elapsed_time = time.time() - start_time
+            self.invalidate_assistant()
+            elapsed_time = time.perf_counter() - start_time
             error_msg = f"Error generating summary: {e} (after {elapsed_time:.2f}s)"
             logger.error(error_msg)
             raise AssistantClientError(error_msg)
 
 
+@functools.lru_cache(maxsize=2)
+def _get_summary_adapter(use_thread_pool: bool = True) -> SummaryAssistantAdapter:
+    """
+    Get the shared summary adapter for a thread pool setting.
+    
+    The adapter is built once per setting and reused by summarize_text and
+    summarize_texts. SummaryAssistantAdapter.clear_cache() drops it.
+    
+    Args:
+        use_thread_pool: Whether the adapter reuses threads from the pool
+        
+    Returns:
+        SummaryAssistantAdapter: The shared adapter
+    """
+    return SummaryAssistantAdapter(use_thread_pool=use_thread_pool)
+
 def summarize_text(
     text: str, 
     summary_type: str = "comprehensive", 
@@ -381,11 +456,58 @@ def summarize_text(
         AssistantClientError: If processing fails
     """
     # The detailed timing and process logging is already handled in the adapter's method
-    adapter = SummaryAssistantAdapter(use_thread_pool=use_thread_pool)
+    adapter = _get_summary_adapter(use_thread_pool)
     return adapter.summarize_text(
         text=text,
         summary_type=summary_type,
         target_length=target_length,
         focus_areas=focus_areas,
         force_new_thread=force_new_thread
-    ) 
\ No newline at end of file
+    ) 
+
+
+def summarize_texts(
+    texts: List[str],
+    summary_type: str = "comprehensive",
+    target_length: int = 100,
+    focus_areas: Optional[List[str]] = None,
+    use_thread_pool: bool = True,
+    max_workers: int = 8
+) -> List[str]:
+    """
+    Summarize several texts concurrently with the shared summary adapter.
+    
+    Each summary is an independent OpenAI round-trip, so the texts are sent
+    from a pool of worker threads instead of one after another.
+    
+    Args:
+        texts: The texts to summarize
+        summary_type: Type of summary (comprehensive, bullet_points, etc.)
+        target_length: Target word count for each summary
+        focus_areas: Optional specific areas to focus on
+        use_thread_pool: Whether to reuse OpenAI threads between summaries
+                         (without it, each summary runs on its own new thread)
+        max_workers: Maximum number of summaries in flight at once
+        
+    Returns:
+        List[str]: One summary per input text, in the same order
+        
+    Raises:
+        ConfigError: If required configuration is missing
+        AssistantClientError: If processing any of the texts fails
+    """
+    if not texts:
+        return []
+    
+    adapter = _get_summary_adapter(use_thread_pool)
+    # Without the pool every summary would go to the one saved default
+    # thread, which rejects concurrent runs, so each gets a new thread
+    force_new_thread = not use_thread_pool
+    with ThreadPoolExecutor(max_workers=min(len(texts), max_workers)) as executor:
+        futures = [
+            executor.submit(
+                adapter.summarize_text, text, summary_type, target_length, focus_areas, force_new_thread
+            )
+            for text in texts
+        ]
+        return [future.result() for future in futures]
@@ -7,17 +7,140 @@ A centralized module for managing and interacting with OpenAI assistants.
 import os
 import json
 import time
+import atexit
+import asyncio
+import functools
+import threading
 from pathlib import Path
-from datetime import datetime
 from typing import Dict, Any, Optional, Tuple, List, Union, Callable
 
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient, NOT_GIVEN
 
 from jassist.logger_utils.logger_utils import setup_logger
+from jassist.utils.path_utils import resolve_path
 from jassist.api_assistants_cliente.exceptions import AssistantError, ThreadError, RunError, ConfigError
+from jassist.api_assistants_cliente.config_manager import created_at_epoch
+from jassist.api_assistants_cliente.config_store import SqliteConfigStore, get_config_store
+from jassist.api_assistants_cliente.prompt_template import compile_template
+from jassist.api_assistants_cliente.polling import poll_intervals
+from jassist.api_assistants_cliente.rate_limiter import get_rate_limiter, event_hooks, async_event_hooks
+
+# Optional faster JSON (de)serializer for config files
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = setup_logger("api_assistants_cliente", module="api_assistants_cliente")
 
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Appended to batched prompts so the reply can be split back into one result per input
+BATCH_RESPONSE_INSTRUCTIONS = (
+    "\n\nThe input above is a numbered list of {count} separate items. Handle each "
+    "item on its own and reply only with a JSON object of the form "
+    '{{"results": [...]}}, holding exactly {count} results in the same order.'
+)
+
+def _dump_config(config: Dict[str, Any]) -> bytes:
+    """
+    Serialize a config dict as indented JSON.
+    
+    Args:
+        config: Configuration dictionary
+        
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(config, option=orjson.OPT_INDENT_2)
+    return json.dumps(config, indent=2).encode("utf-8")
+
+# Maximum number of (path, signature) config files kept in memory
+MAX_CACHED_CONFIG_FILES = 32
+
+# Seconds an assistant that was found to exist is trusted without checking again
+ASSISTANT_VERIFY_TTL = 3600
+
+# Run statuses after which a run no longer changes without user action
+RUN_TERMINAL_STATUSES = {"completed", "failed", "cancelled", "expired", "incomplete", "requires_action"}
+
+# Maximum number of thread keys whose config key names a client keeps
+MAX_CACHED_THREAD_KEYS = 64
+
+# Serializes config cache misses so concurrent clients parse a file only once
+_CONFIG_LOCK = threading.Lock()
+
+@functools.lru_cache(maxsize=MAX_CACHED_CONFIG_FILES)
+def _read_config_file(config_path: str, signature: Tuple[int, int]) -> Dict[str, Any]:
+    """
+    Parse a config file at a given modification time and size.
+    
+    The file signature is part of the cache key, so an edited or re-saved
+    file misses the cache and its old entry ages out of the LRU.
+    
+    Args:
+        config_path: Path to the config file
+        signature: The file's (modification time in nanoseconds, size)
+        
+    Returns:
+        Dict: Configuration dictionary
+    """
+    logger.debug(f"Caching config from {config_path}")
+    with open(config_path, "rb") as f:
+        return _json_loads(f.read())
+
+@functools.lru_cache(maxsize=4)
+def _get_openai_client(api_key: str) -> OpenAI:
+    """
+    Get the process-wide OpenAI client for an API key.
+    
+    Sharing the client shares its HTTP connection pool, so assistant
+    clients built for the same key reuse open connections instead of
+    setting up new TCP and TLS sessions.
+    Every request first waits on the key's rate limiter, which the
+    response headers keep in step with the limits OpenAI reports.
+    
+    Args:
+        api_key: OpenAI API key
+        
+    Returns:
+        OpenAI: Client for the key
+    """
+    logger.debug("Created shared OpenAI client")
+    return OpenAI(
+        api_key=api_key,
+        http_client=DefaultHttpxClient(event_hooks=event_hooks(get_rate_limiter(api_key)))
+    )
+
+def _poll_interval_ms(poll_interval: Optional[float]) -> Any:
+    """
+    Convert a polling interval for the SDK's create_and_poll helpers.
+    
+    When no interval is given the SDK waits as long as the server's
+    openai-poll-after-ms header asks, which adapts to how busy the run is.
+    
+    Args:
+        poll_interval: Seconds between status checks, or None
+        
+    Returns:
+        int: Milliseconds between status checks, or NOT_GIVEN
+    """
+    return int(poll_interval * 1000) if poll_interval else NOT_GIVEN
+
+def _flush_at_exit(client: "OpenAIAssistantClient") -> None:
+    """
+    Flush a client's pending config changes when the interpreter exits.
+    
+    The hook holds the client only while it has unsaved changes, so a
+    client dropped without being closed still gets its changes written.
+    
+    Args:
+        client: The client with pending changes
+    """
+    client.flush()
+
 class OpenAIAssistantClient:
     """
     Centralized client for managing OpenAI assistants across different modules.
@@ -33,7 +156,8 @@ class OpenAIAssistantClient:
         module_name: Optional[str] = None,
         model_name: Optional[str] = None,
         instructions: Optional[str] = None,
-        tools: Optional[List[Dict[str, Any]]] = None
+        tools: Optional[List[Dict[str, Any]]] = None,
+        config_store: Optional[SqliteConfigStore] = None
     ):
         """
         Initialize the assistant client.
@@ -47,6 +171,8 @@ class OpenAIAssistantClient:
             model_name: OpenAI model to use (overrides config if provided)
             instructions: Instructions for the assistant (overrides config if provided)
             tools: List of tools for the assistant (overrides config if provided)
+            config_store: SQLite store for assistant and thread IDs (defaults to the
+                          "state_db" config value; IDs are kept in the config if neither is set)
             
         Raises:
             ConfigError: If required configuration is missing
@@ -67,6 +193,16 @@ class OpenAIAssistantClient:
         # Initialize the OpenAI client
         self.client = client if client is not None else self._initialize_client(config)
         
+        # Thread changes are written by flush(), not on every mutation;
+        # the exit hook is registered only while changes are pending
+        self._config_dirty = False
+        self._exit_hook = None
+        
+        # Assistant and thread IDs go to a shared SQLite store when one is configured
+        if config_store is None and config.get("state_db"):
+            config_store = get_config_store(str(resolve_path(config["state_db"])))
+        self.config_store = config_store
+        
         # Set assistant properties, with passed values taking precedence over config
         self.assistant_name = assistant_name or config.get('assistant_name')
         if not self.assistant_name:
@@ -84,8 +220,17 @@ class OpenAIAssistantClient:
             # Default to empty tools list rather than failing
             self.tools = []
         
+        # Normalize the name once; every config key for this assistant uses it
+        self._norm_name = self.assistant_name.lower().replace(' ', '_')
+        
         # Format the key for storing this specific assistant's ID
-        self.assistant_key = f"assistant_id_{self.assistant_name.lower().replace(' ', '_')}"
+        self.assistant_key = f"assistant_id_{self._norm_name}"
+        
+        # (thread ID key, creation time key) by thread key
+        self._thread_keys = {}
+        
+        # Monotonic time the configured assistant was last found to exist
+        self._assistant_verified_at = None
     
     def _initialize_client(self, config: Dict[str, Any]) -> OpenAI:
         """
@@ -110,12 +255,45 @@ class OpenAIAssistantClient:
         if not api_key:
             raise ConfigError("Missing OpenAI API key. Set it in config or as OPENAI_API_KEY environment variable.")
             
-        return OpenAI(api_key=api_key)
+        return _get_openai_client(api_key)
+    
+    def _new_async_client(self) -> AsyncOpenAI:
+        """
+        Create an async OpenAI client sharing the sync client's credentials and rate limiter.
+        
+        Its connections belong to the event loop that uses it, so each
+        batch of async calls creates its own and closes it when done.
+        
+        Returns:
+            AsyncOpenAI: New async client, to be used with async with
+        """
+        limiter = get_rate_limiter(self.client.api_key)
+        return AsyncOpenAI(
+            api_key=self.client.api_key,
+            base_url=self.client.base_url,
+            http_client=DefaultAsyncHttpxClient(event_hooks=async_event_hooks(limiter))
+        )
+    
+    async def _get_or_create_assistant_async(self) -> str:
+        """
+        Resolve the assistant ID without blocking the event loop.
+        
+        Returns:
+            str: Assistant ID
+            
+        Raises:
+            AssistantError: If assistant creation fails
+        """
+        loop = asyncio.get_running_loop()
+        assistant_id, _ = await loop.run_in_executor(None, self.get_or_create_assistant)
+        return assistant_id
     
     def _load_config(self, config_path: Path) -> Dict[str, Any]:
         """
         Load configuration from file.
         
+        Parsed files are cached until their modification time or size changes.
+        
         Args:
             config_path: Path to config file
             
@@ -125,19 +303,28 @@ class OpenAIAssistantClient:
         Raises:
             ConfigError: If the file doesn't exist or has parsing errors
         """
-        if not config_path.exists():
+        # One stat both checks that the file exists and keys the cache
+        try:
+            stat = os.stat(config_path)
+        except FileNotFoundError:
             raise ConfigError(f"Config file not found: {config_path}")
             
         try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with _CONFIG_LOCK:
+                config = _read_config_file(str(config_path), (stat.st_mtime_ns, stat.st_size))
         except Exception as e:
             raise ConfigError(f"Error loading config: {e}")
+        
+        # Copy so the IDs this client records do not leak into the cached dict
+        return dict(config)
     
     def _save_config(self, config_path: Path) -> bool:
         """
         Save current configuration to file.
         
+        The file is replaced atomically, so readers see either the old or
+        the new config, never a partial one.
+        
         Args:
             config_path: Path to save config
             
@@ -151,18 +338,180 @@ class OpenAIAssistantClient:
             # Ensure parent directories exist
             config_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(config_path, "w", encoding="utf-8") as f:
-                json.dump(self.config, f, indent=2)
+            # Write a temporary file and swap it in, so a crash mid-write
+            # never leaves a truncated config behind
+            tmp_path = config_path.with_name(f"{config_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(_dump_config(self.config))
+            os.replace(tmp_path, config_path)
             return True
         except Exception as e:
             raise ConfigError(f"Error saving config: {e}")
     
+    def save_module_config(self) -> bool:
+        """
+        Save the current configuration to the module's assistant config file.
+        
+        Failures are logged rather than raised, since the in-memory config
+        stays usable.
+        
+        Returns:
+            bool: True if the config was saved, False if there is no module or saving failed
+        """
+        if not self.module_name:
+            return False
+        
+        from .config_manager import get_module_dir
+        try:
+            module_dir = get_module_dir(self.module_name)
+            config_file = module_dir / "config" / f"{self.module_name}_assistant_config.json"
+            self._save_config(config_file)
+            logger.info(f"Saved updated config to {config_file}")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not save config to module directory: {e}")
+            return False
+    
+    def set_config_value(self, key: str, value: Any) -> None:
+        """
+        Set a config value, to be written on the next flush.
+        
+        Args:
+            key: Config key
+            value: JSON-serializable value
+        """
+        self.config[key] = value
+        self._mark_dirty()
+    
+    def _mark_dirty(self) -> None:
+        """
+        Record that the config has unsaved changes and make sure they are written at exit.
+        """
+        self._config_dirty = True
+        if self._exit_hook is None:
+            self._exit_hook = functools.partial(_flush_at_exit, self)
+            atexit.register(self._exit_hook)
+    
+    def flush(self) -> bool:
+        """
+        Write pending config changes to the module's assistant config file.
+        
+        Thread IDs recorded since the last flush are kept in memory until
+        this is called, the client is closed, or the interpreter exits. Assistant ID changes are written immediately.
+        
+        Returns:
+            bool: True if nothing was pending or the config was saved
+        """
+        if not self._config_dirty:
+            return True
+        if self.save_module_config():
+            self._config_dirty = False
+            if self._exit_hook is not None:
+                atexit.unregister(self._exit_hook)
+                self._exit_hook = None
+            return True
+        return False
+    
+    def close(self) -> None:
+        """
+        Flush pending config changes and drop the exit hook.
+        """
+        self.flush()
+        if self._exit_hook is not None:
+            atexit.unregister(self._exit_hook)
+            self._exit_hook = None
+    
+    def __enter__(self) -> "OpenAIAssistantClient":
+        """Use the client as a context manager that flushes config changes on exit."""
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Flush pending config changes, even when leaving on an exception."""
+        self.close()
+    
+    def _get_saved_assistant_id(self) -> Optional[str]:
+        """
+        Get the saved ID of this assistant, from the store if one is configured.
+        
+        Returns:
+            str: Assistant ID, or None if none is saved
+        """
+        if self.config_store is not None:
+            assistant_id = self.config_store.get_assistant_id(self._norm_name)
+            if assistant_id:
+                return assistant_id
+        return self.config.get(self.assistant_key)
+    
+    def _save_assistant_id(self, assistant_id: Optional[str]) -> None:
+        """
+        Save or remove the ID of this assistant, writing the config immediately.
+        
+        Args:
+            assistant_id: Assistant ID, or None to remove it
+        """
+        if self.config_store is not None:
+            self.config_store.set_assistant_id(self._norm_name, assistant_id)
+            # Drop any ID left in the config so it is not picked up later
+            if assistant_id is None and self.assistant_key in self.config:
+                del self.config[self.assistant_key]
+                self._mark_dirty()
+                self.flush()
+            return
+        
+        if assistant_id is None:
+            del self.config[self.assistant_key]
+        else:
+            self.config[self.assistant_key] = assistant_id
+        # Written right away: losing an assistant ID orphans the assistant on OpenAI
+        self._mark_dirty()
+        self.flush()
+    
+    def _get_saved_thread(self, full_thread_key: str, created_at_key: str) -> Tuple[Optional[str], Any]:
+        """
+        Get a saved thread, from the store if one is configured.
+        
+        Args:
+            full_thread_key: Key of the thread ID
+            created_at_key: Key of the thread creation time
+            
+        Returns:
+            Tuple: (thread ID, stored creation time), each None if not saved
+        """
+        if self.config_store is not None:
+            saved = self.config_store.get_thread(full_thread_key)
+            if saved:
+                return saved
+        return self.config.get(full_thread_key), self.config.get(created_at_key)
+    
+    def _save_thread(self, full_thread_key: str, created_at_key: str, thread_id: str, created_at: float) -> None:
+        """
+        Save a thread ID and its creation time.
+        
+        Args:
+            full_thread_key: Key of the thread ID
+            created_at_key: Key of the thread creation time
+            thread_id: Thread ID
+            created_at: Creation time as epoch seconds
+        """
+        if self.config_store is not None:
+            self.config_store.set_thread(full_thread_key, thread_id, created_at)
+        else:
+            self.config[full_thread_key] = thread_id
+            self.config[created_at_key] = created_at
+            self._mark_dirty()
+    
+    def invalidate_assistant(self) -> None:
+        """
+        Make the next get_or_create_assistant call check the assistant again.
+        """
+        self._assistant_verified_at = None
+    
     def get_or_create_assistant(self) -> Tuple[str, bool]:
         """
         Get an existing assistant or create a new one if not found.
         
-        This will always check if the assistant exists and create a new one
-        if it cannot be found, regardless of whether we have an ID in the config.
+        This checks that the configured assistant exists and creates a new
+        one if it cannot be found. A successful check is trusted for
+        ASSISTANT_VERIFY_TTL seconds, so calls in between skip the request.
         
         Returns:
             Tuple[str, bool]: (assistant_id, was_created)
@@ -170,13 +519,18 @@ class OpenAIAssistantClient:
         Raises:
             AssistantError: If assistant creation fails
         """
-        # Look for an existing assistant ID in the config
-        if self.assistant_key in self.config:
-            assistant_id = self.config[self.assistant_key]
+        # Look for an existing assistant ID
+        assistant_id = self._get_saved_assistant_id()
+        if assistant_id:
+            # Skip the check while the last one is recent enough
+            verified_at = self._assistant_verified_at
+            if verified_at is not None and time.monotonic() - verified_at < ASSISTANT_VERIFY_TTL:
+                return assistant_id, False
             
             # Verify the assistant exists
             try:
                 assistant = self.client.beta.assistants.retrieve(assistant_id)
+                self._assistant_verified_at = time.monotonic()
                 logger.info(f"Using existing assistant: {assistant_id}")
                 return assistant_id, False
             except Exception as e:
@@ -206,18 +560,8 @@ class OpenAIAssistantClient:
             assistant_id = assistant.id
             
             # Save the new assistant ID
-            self.config[self.assistant_key] = assistant_id
-            
-            # Save config if we have module_name
-            if self.module_name:
-                from .config_manager import get_module_dir
-                try:
-                    module_dir = get_module_dir(self.module_name)
-                    config_file = module_dir / "config" / f"{self.module_name}_assistant_config.json"
-                    self._save_config(config_file)
-                    logger.info(f"Saved updated config to {config_file}")
-                except Exception as e:
-                    logger.warning(f"Could not save config to module directory: {e}")
+            self._save_assistant_id(assistant_id)
+            self._assistant_verified_at = time.monotonic()
             
             logger.info(f"Created new assistant with ID: {assistant_id}")
             return assistant_id, True
@@ -239,7 +583,7 @@ class OpenAIAssistantClient:
         """
         # If no ID provided, try to get it from config
         if not assistant_id:
-            assistant_id = self.config.get(self.assistant_key)
+            assistant_id = self._get_saved_assistant_id()
             if not assistant_id:
                 logger.info(f"No assistant ID found to delete for {self.assistant_name}")
                 return True
@@ -252,8 +596,9 @@ class OpenAIAssistantClient:
             logger.warning(f"Failed to delete assistant from OpenAI (may already be deleted): {e}")
         
         # Remove from config if we're using the assistant key
-        if self.assistant_key in self.config and self.config[self.assistant_key] == assistant_id:
-            del self.config[self.assistant_key]
+        if self._get_saved_assistant_id() == assistant_id:
+            self._save_assistant_id(None)
+            self.invalidate_assistant()
         
         return True
     
@@ -272,11 +617,17 @@ class OpenAIAssistantClient:
         Returns:
             str: Thread ID
         """
-        # Format the key for storing this specific thread
-        full_thread_key = f"thread_id_{self.assistant_name.lower().replace(' ', '_')}_{thread_key}"
-        created_at_key = f"{full_thread_key}_created_at"
+        # Format the keys for storing this specific thread, once per thread key
+        keys = self._thread_keys.get(thread_key)
+        if keys is None:
+            full_thread_key = f"thread_id_{self._norm_name}_{thread_key}"
+            keys = (full_thread_key, f"{full_thread_key}_created_at")
+            # Capped, since pooled and forced new threads use one-off keys
+            if len(self._thread_keys) < MAX_CACHED_THREAD_KEYS:
+                self._thread_keys[thread_key] = keys
+        full_thread_key, created_at_key = keys
         
-        thread_id = self.config.get(full_thread_key)
+        thread_id, stored = self._get_saved_thread(full_thread_key, created_at_key)
         thread_needs_recreation = False
         
         if thread_id:
@@ -284,16 +635,19 @@ class OpenAIAssistantClient:
                 thread = self.client.beta.threads.retrieve(thread_id)
                 
                 # Check if thread needs rotation
-                if created_at_key in self.config:
-                    try:
-                        created_at = datetime.fromisoformat(self.config[created_at_key])
-                        days_old = (datetime.now() - created_at).days
+                if stored is not None:
+                    created_at = created_at_epoch(stored)
+                    if created_at is None:
+                        logger.warning(f"Error parsing thread creation date: {stored!r}")
+                        thread_needs_recreation = True
+                    else:
+                        if not isinstance(stored, (int, float)):
+                            # Rewrite legacy ISO dates as epoch seconds
+                            self._save_thread(full_thread_key, created_at_key, thread_id, created_at)
+                        days_old = int((time.time() - created_at) // 86400)
                         if days_old > retention_days:
                             thread_needs_recreation = True
                             logger.info(f"Thread is {days_old} days old, recreating due to retention policy")
-                    except (ValueError, TypeError) as e:
-                        logger.warning(f"Error parsing thread creation date: {e}")
-                        thread_needs_recreation = True
             except Exception as e:
                 logger.error(f"Error retrieving thread: {e}")
                 thread_needs_recreation = True
@@ -307,19 +661,7 @@ class OpenAIAssistantClient:
             # Only save to config if requested (temporary threads won't be saved)
             if save_to_config:
                 # Save the new thread ID and creation time
-                self.config[full_thread_key] = thread_id
-                self.config[created_at_key] = datetime.now().isoformat()
-                
-                # Save config if we have module_name
-                if self.module_name:
-                    from .config_manager import get_module_dir
-                    try:
-                        module_dir = get_module_dir(self.module_name)
-                        config_file = module_dir / "config" / f"{self.module_name}_assistant_config.json"
-                        self._save_config(config_file)
-                        logger.info(f"Saved updated config to {config_file}")
-                    except Exception as e:
-                        logger.warning(f"Could not save config to module directory: {e}")
+                self._save_thread(full_thread_key, created_at_key, thread_id, time.time())
             else:
                 logger.debug(f"Created temporary thread with ID: {thread_id} (not saved to config)")
             
@@ -333,8 +675,9 @@ class OpenAIAssistantClient:
         thread_id: Optional[str] = None,
         assistant_id: Optional[str] = None,
         max_retries: int = 1,
-        poll_interval: float = 1.0,
-        timeout: int = 300
+        poll_interval: Optional[float] = None,
+        timeout: int = 300,
+        ephemeral_thread: bool = False
     ) -> Optional[str]:
         """
         Run the assistant with the given prompt.
@@ -344,8 +687,12 @@ class OpenAIAssistantClient:
             thread_id: Thread ID to use (will create if None)
             assistant_id: Assistant ID to use (will create if None)
             max_retries: Maximum number of times to retry on assistant errors
-            poll_interval: How often to check run status in seconds
-            timeout: Maximum seconds to wait for completion
+            poll_interval: How often to check run status in seconds (by default
+                           polling starts fast and backs off)
+            timeout: Maximum seconds to wait for each run attempt to complete
+            ephemeral_thread: Without a thread_id, run on a new unsaved thread
+                              created in the same request as the run, instead
+                              of the saved default thread
             
         Returns:
             Optional[str]: The assistant's response or None if failed
@@ -353,27 +700,29 @@ class OpenAIAssistantClient:
         Raises:
             ThreadError: If thread operations fail
             RunError: If run operations fail
-            TimeoutError: If run times out
+            TimeoutError: If run times out (the run is cancelled and not retried)
         """
         # Get the assistant ID, creating if needed
-        if not assistant_id:
+        resolve_assistant = not assistant_id
+        if resolve_assistant:
             assistant_id, _ = self.get_or_create_assistant()
         
         # Get or create thread if not provided
-        if not thread_id:
+        if not thread_id and not ephemeral_thread:
             thread_id = self.get_or_create_thread()
         
-        # Create message
-        try:
-            self.client.beta.threads.messages.create(
-                thread_id=thread_id,
-                role="user",
-                content=prompt
-            )
-        except Exception as e:
-            error_msg = f"Error creating message in thread: {e}"
-            logger.error(error_msg)
-            raise ThreadError(error_msg)
+        # Create message; an ephemeral thread gets it along with the run
+        if thread_id:
+            try:
+                self.client.beta.threads.messages.create(
+                    thread_id=thread_id,
+                    role="user",
+                    content=prompt
+                )
+            except Exception as e:
+                error_msg = f"Error creating message in thread: {e}"
+                logger.error(error_msg)
+                raise ThreadError(error_msg)
         
         # Try to run with retries
         retries = 0
@@ -381,60 +730,51 @@ class OpenAIAssistantClient:
         
         while retries <= max_retries:
             try:
-                # Start the run
-                run = self.client.beta.threads.runs.create(
-                    thread_id=thread_id,
-                    assistant_id=assistant_id
-                )
+                if retries and resolve_assistant:
+                    # The assistant may be gone; check it again, recreating if needed
+                    assistant_id, _ = self.get_or_create_assistant()
                 
-                # Wait for completion with timeout
-                start_time = time.time()
-                while time.time() - start_time < timeout:
-                    run_status = self.client.beta.threads.runs.retrieve(
+                # Start the run and poll it to a terminal status
+                deadline = time.monotonic() + timeout
+                if thread_id:
+                    run = self.client.beta.threads.runs.create(
                         thread_id=thread_id,
-                        run_id=run.id
+                        assistant_id=assistant_id
                     )
-                    
-                    # Check for completion or error
-                    if run_status.status == "completed":
-                        break
-                    elif run_status.status in ["failed", "cancelled", "expired"]:
-                        error_msg = f"Run failed with status {run_status.status}"
-                        if hasattr(run_status, 'last_error'):
-                            error_msg += f": {run_status.last_error}"
-                        raise RunError(error_msg)
-                    
-                    # Wait before checking again
-                    time.sleep(poll_interval)
-                
-                # Check for timeout
-                if time.time() - start_time >= timeout:
-                    raise TimeoutError(f"Assistant run timed out after {timeout} seconds")
+                else:
+                    # Create the thread, its message and the run in one request
+                    run = self.client.beta.threads.create_and_run(
+                        assistant_id=assistant_id,
+                        thread={"messages": [{"role": "user", "content": prompt}]}
+                    )
+                run = self._wait_for_run(run, deadline, timeout, poll_interval)
+                self._check_run(run)
                 
-                # Get messages
-                messages = self.client.beta.threads.messages.list(thread_id=thread_id)
-                for message in messages.data:
-                    if message.role == "assistant":
-                        # Handle text content
-                        if hasattr(message, 'content') and message.content:
-                            for content_part in message.content:
-                                if hasattr(content_part, 'text') and content_part.text:
-                                    return content_part.text.value
+                # Get only the newest message, which is the run's reply
+                messages = self.client.beta.threads.messages.list(
+                    thread_id=run.thread_id,
+                    limit=1,
+                    order="desc"
+                )
+                return self._extract_response(messages)
                 
-                # If we got here but found no response content
-                return None
+            except TimeoutError:
+                # The run was cancelled; retrying would wait out the timeout again
+                raise
                 
-            except (RunError, ThreadError, TimeoutError) as e:
+            except (RunError, ThreadError) as e:
                 # These errors are specific and should be re-raised
                 last_error = e
                 logger.error(f"Error during run (attempt {retries+1}/{max_retries+1}): {e}")
                 retries += 1
+                self.invalidate_assistant()
                 
             except Exception as e:
                 # General errors
                 last_error = e
                 logger.error(f"Unexpected error during run (attempt {retries+1}/{max_retries+1}): {e}")
                 retries += 1
+                self.invalidate_assistant()
         
         # If we reach here, all retries failed
         if last_error:
@@ -442,6 +782,244 @@ class OpenAIAssistantClient:
         
         return None
     
+    def _wait_for_run(self, run: Any, deadline: float, timeout: float, poll_interval: Optional[float]) -> Any:
+        """
+        Poll a run until it reaches a terminal status or the deadline passes.
+        
+        Args:
+            run: The run as returned when it was created
+            deadline: Monotonic time by which the run must finish
+            timeout: The timeout the deadline was built from, for the error message
+            poll_interval: Seconds between status checks, or None to back off
+            
+        Returns:
+            Run: The run in its terminal status
+            
+        Raises:
+            TimeoutError: If the deadline passes first; the run is cancelled
+        """
+        intervals = poll_intervals() if not poll_interval else None
+        while run.status not in RUN_TERMINAL_STATUSES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                try:
+                    self.client.beta.threads.runs.cancel(thread_id=run.thread_id, run_id=run.id)
+                except Exception as e:
+                    logger.warning(f"Failed to cancel timed out run {run.id}: {e}")
+                raise TimeoutError(f"Assistant run timed out after {timeout} seconds")
+            
+            time.sleep(min(next(intervals) if intervals else poll_interval, remaining))
+            run = self.client.beta.threads.runs.retrieve(thread_id=run.thread_id, run_id=run.id)
+        return run
+    
+    @staticmethod
+    def _check_run(run: Any) -> None:
+        """
+        Check that a polled run completed.
+        
+        Args:
+            run: Run returned by the API once it reached a terminal status
+            
+        Raises:
+            RunError: If the run did not complete
+        """
+        if run.status != "completed":
+            error_msg = f"Run failed with status {run.status}"
+            if getattr(run, 'last_error', None):
+                error_msg += f": {run.last_error}"
+            raise RunError(error_msg)
+    
+    @staticmethod
+    def _extract_response(messages: Any) -> Optional[str]:
+        """
+        Get the text of the latest assistant message in a thread's message list.
+        
+        Args:
+            messages: Message list returned by the API, newest first (usually
+                      just the newest message)
+            
+        Returns:
+            Optional[str]: The assistant's response or None if there is none
+        """
+        for message in messages.data:
+            if message.role == "assistant":
+                # Handle text content
+                if hasattr(message, 'content') and message.content:
+                    for content_part in message.content:
+                        if hasattr(content_part, 'text') and content_part.text:
+                            return content_part.text.value
+        return None
+    
+    async def run_assistant_async(
+        self,
+        prompt: str,
+        thread_id: Optional[str] = None,
+        assistant_id: Optional[str] = None,
+        poll_interval: Optional[float] = None,
+        timeout: int = 300,
+        async_client: Optional[AsyncOpenAI] = None
+    ) -> Optional[str]:
+        """
+        Run the assistant with the given prompt without blocking the event loop.
+        
+        A thread only accepts one active run at a time, so without a
+        thread_id the prompt is sent on a new temporary thread.
+        
+        Args:
+            prompt: User prompt to send
+            thread_id: Thread ID to use (a temporary thread is created if None)
+            assistant_id: Assistant ID to use (will create if None)
+            poll_interval: How often to check run status in seconds (by default
+                           the SDK follows the server's polling hint)
+            timeout: Maximum seconds to wait for completion
+            async_client: Async client to use (a new one is created and closed if None)
+            
+        Returns:
+            Optional[str]: The assistant's response or None if there is none
+            
+        Raises:
+            ThreadError: If thread operations fail
+            RunError: If run operations fail
+            TimeoutError: If run times out
+        """
+        if async_client is None:
+            async with self._new_async_client() as client:
+                return await self.run_assistant_async(
+                    prompt, thread_id, assistant_id, poll_interval, timeout, async_client=client
+                )
+        client = async_client
+        
+        if not assistant_id:
+            assistant_id = await self._get_or_create_assistant_async()
+        
+        # Add the message to an existing thread
+        if thread_id:
+            try:
+                await client.beta.threads.messages.create(
+                    thread_id=thread_id,
+                    role="user",
+                    content=prompt
+                )
+            except Exception as e:
+                error_msg = f"Error creating message in thread: {e}"
+                logger.error(error_msg)
+                raise ThreadError(error_msg)
+            run_and_poll = client.beta.threads.runs.create_and_poll(
+                thread_id=thread_id,
+                assistant_id=assistant_id,
+                poll_interval_ms=_poll_interval_ms(poll_interval)
+            )
+        else:
+            # Create the thread, its message and the run in one request
+            run_and_poll = client.beta.threads.create_and_run_poll(
+                assistant_id=assistant_id,
+                thread={"messages": [{"role": "user", "content": prompt}]},
+                poll_interval_ms=_poll_interval_ms(poll_interval)
+            )
+        
+        try:
+            # Poll to a terminal status, yielding to other runs in between
+            run = await asyncio.wait_for(run_and_poll, timeout)
+            self._check_run(run)
+            
+            messages = await client.beta.threads.messages.list(
+                thread_id=run.thread_id,
+                limit=1,
+                order="desc"
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Assistant run timed out after {timeout} seconds")
+        except RunError:
+            raise
+        except Exception as e:
+            error_msg = f"Unexpected error during run: {e}"
+            logger.error(error_msg)
+            raise RunError(error_msg)
+        
+        return self._extract_response(messages)
+    
+    async def run_many(
+        self,
+        prompts: List[str],
+        concurrency: int = 10,
+        assistant_id: Optional[str] = None,
+        poll_interval: Optional[float] = None,
+        timeout: int = 300
+    ) -> List[Union[Optional[str], BaseException]]:
+        """
+        Run the assistant on several prompts concurrently.
+        
+        Each prompt gets its own temporary thread. At most `concurrency`
+        runs are in flight at once.
+        
+        Args:
+            prompts: User prompts to send
+            concurrency: Maximum number of concurrent runs
+            assistant_id: Assistant ID to use (will create if None)
+            poll_interval: How often to check run status in seconds (by default
+                           the SDK follows the server's polling hint)
+            timeout: Maximum seconds to wait for each run
+            
+        Returns:
+            List: The response for each prompt, in order, or the exception
+            raised while processing it
+        """
+        # Resolve the assistant once instead of once per prompt
+        if not assistant_id:
+            assistant_id = await self._get_or_create_assistant_async()
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        # A client per call, so concurrent calls never close each other's connections
+        async with self._new_async_client() as client:
+            async def run_one(prompt: str) -> Optional[str]:
+                async with semaphore:
+                    return await self.run_assistant_async(
+                        prompt=prompt,
+                        assistant_id=assistant_id,
+                        poll_interval=poll_interval,
+                        timeout=timeout,
+                        async_client=client
+                    )
+            
+            return await asyncio.gather(
+                *(run_one(prompt) for prompt in prompts),
+                return_exceptions=True
+            )
+    
+    def format_prompt(
+        self,
+        input_text: str,
+        prompt_template: str,
+        template_vars: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Format a prompt template for the given input text.
+        
+        Args:
+            input_text: The text to process
+            prompt_template: Template string for the prompt
+            template_vars: Variables to format the template with
+            
+        Returns:
+            str: The formatted prompt
+            
+        Raises:
+            ConfigError: If template variables are missing
+        """
+        # Prepare variables for template
+        vars_dict = template_vars or {}
+        vars_dict['input_text'] = input_text
+        
+        # Format prompt with all required parameters; the template is parsed
+        # once and reused for every later input
+        try:
+            return compile_template(prompt_template).render(vars_dict)
+        except KeyError as e:
+            error_msg = f"Missing template variable: {e}"
+            logger.error(error_msg)
+            raise ConfigError(error_msg)
+    
     def process_with_prompt_template(
         self,
         input_text: str,
@@ -449,7 +1027,8 @@ class OpenAIAssistantClient:
         template_vars: Optional[Dict[str, Any]] = None,
         assistant_instructions: Optional[str] = None,
         assistant_id: Optional[str] = None,
-        thread_id: Optional[str] = None
+        thread_id: Optional[str] = None,
+        ephemeral_thread: bool = False
     ) -> str:
         """
         Process input text using a prompt template and the assistant.
@@ -461,6 +1040,8 @@ class OpenAIAssistantClient:
             assistant_instructions: Optional override for assistant instructions (DEPRECATED - use only at creation time)
             assistant_id: Optional assistant ID to use for processing
             thread_id: Optional thread ID to use for processing
+            ephemeral_thread: Without a thread_id, run on a new unsaved thread
+                              instead of the saved default thread
             
         Returns:
             str: The assistant's response
@@ -469,17 +1050,7 @@ class OpenAIAssistantClient:
             ConfigError: If template variables are missing
             RunError: If the assistant run fails
         """
-        # Prepare variables for template
-        vars_dict = template_vars or {}
-        vars_dict['input_text'] = input_text
-        
-        # Format prompt with all required parameters
-        try:
-            prompt = prompt_template.format(**vars_dict)
-        except KeyError as e:
-            error_msg = f"Missing template variable: {e}"
-            logger.error(error_msg)
-            raise ConfigError(error_msg)
+        prompt = self.format_prompt(input_text, prompt_template, template_vars)
         
         # NOTE: We no longer update instructions here - they should only be set at assistant creation time
         # if assistant_instructions:
@@ -489,10 +1060,117 @@ class OpenAIAssistantClient:
         response = self.run_assistant(
             prompt=prompt,
             assistant_id=assistant_id,
-            thread_id=thread_id
+            thread_id=thread_id,
+            ephemeral_thread=ephemeral_thread
         )
         
         if not response:
             raise RunError("No assistant response received")
         
-        return response 
\ No newline at end of file
+        return response
+    
+    def process_many(
+        self,
+        inputs: List[str],
+        prompt_template: str = "{input_text}",
+        template_vars: Optional[Dict[str, Any]] = None,
+        batch_size: int = 50,
+        assistant_id: Optional[str] = None,
+        thread_id: Optional[str] = None
+    ) -> List[str]:
+        """
+        Process many short inputs with one assistant request per batch.
+        
+        Each batch is rendered into the template as a numbered list and the
+        assistant is asked for a JSON object holding one result per item,
+        so the template and instructions are sent once per batch instead of
+        once per input. A batch whose response does not hold exactly one
+        result per item is processed one input at a time instead.
+        
+        Args:
+            inputs: The texts to process
+            prompt_template: Template string for the prompt; {input_text}
+                             receives the numbered list
+            template_vars: Variables to format the template with
+            batch_size: Maximum number of inputs per request
+            assistant_id: Optional assistant ID to use for processing
+            thread_id: Optional thread ID (each batch gets a new unsaved thread if None)
+            
+        Returns:
+            List[str]: One result per input, in order
+            
+        Raises:
+            ConfigError: If template variables are missing
+            RunError: If an assistant run fails
+        """
+        if not assistant_id:
+            assistant_id, _ = self.get_or_create_assistant()
+        
+        results = []
+        for start in range(0, len(inputs), max(batch_size, 1)):
+            batch = inputs[start:start + batch_size]
+            batch_results = self._process_batch(
+                batch, prompt_template, template_vars, assistant_id, thread_id
+            )
+            if batch_results is None:
+                logger.warning(f"Batch response unusable, processing {len(batch)} inputs individually")
+                batch_results = [
+                    self.process_with_prompt_template(
+                        input_text=text,
+                        prompt_template=prompt_template,
+                        template_vars=dict(template_vars or {}),
+                        assistant_id=assistant_id,
+                        thread_id=thread_id,
+                        ephemeral_thread=True
+                    )
+                    for text in batch
+                ]
+            results.extend(batch_results)
+        
+        return results
+    
+    def _process_batch(
+        self,
+        batch: List[str],
+        prompt_template: str,
+        template_vars: Optional[Dict[str, Any]],
+        assistant_id: str,
+        thread_id: Optional[str]
+    ) -> Optional[List[str]]:
+        """
+        Send one batch of inputs to the assistant as a numbered list.
+        
+        Args:
+            batch: The texts to process
+            prompt_template: Template string for the prompt
+            template_vars: Variables to format the template with
+            assistant_id: Assistant ID to use for processing
+            thread_id: Optional thread ID to use for processing
+            
+        Returns:
+            List[str]: One result per input, or None if the response could
+            not be matched to the batch
+        """
+        numbered = "\n".join(f"{index}. {text}" for index, text in enumerate(batch, 1))
+        prompt = self.format_prompt(numbered, prompt_template, dict(template_vars or {}))
+        prompt += BATCH_RESPONSE_INSTRUCTIONS.format(count=len(batch))
+        
+        response = self.run_assistant(
+            prompt=prompt,
+            assistant_id=assistant_id,
+            thread_id=thread_id,
+            ephemeral_thread=True
+        )
+        if not response:
+            return None
+        
+        # Tolerate text or code fences around the JSON object
+        start, end = response.find("{"), response.rfind("}")
+        try:
+            items = _json_loads(response[start:end + 1]).get("results") if start != -1 and end > start else None
+        except (ValueError, AttributeError):
+            items = None
+        if not isinstance(items, list) or len(items) != len(batch):
+            return None
+        
+        return [item if isinstance(item, str) else json.dumps(item, ensure_ascii=False) for item in items]
@@ -5,6 +5,8 @@ This module provides command-line tools for working with OpenAI assistants.
 """
 
 import sys
+import json
+import asyncio
 import argparse
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Union
@@ -14,7 +16,9 @@ from openai import OpenAI
 from jassist.logger_utils.logger_utils import setup_logger
 from jassist.utils.path_utils import resolve_path
 from jassist.api_assistants_cliente.api_assistants_cliente import OpenAIAssistantClient
-from jassist.api_assistants_cliente.config_manager import load_assistant_config
+from jassist.api_assistants_cliente.batch import submit_batch, collect_batch
+from jassist.api_assistants_cliente.adapters._prompts import load_prompts
+from jassist.api_assistants_cliente.config_manager import load_assistant_config, compile_prompts_file, get_module_dir
 from jassist.api_assistants_cliente.exceptions import AssistantClientError, ConfigError
 
 logger = setup_logger("api_assistants_cliente_cli", module="api_assistants_cliente")
@@ -66,6 +70,8 @@ def get_prompt_template(
     """
     Get a prompt template by name.
     
+    Prompts files are parsed once and reused across calls until they change.
+    
     Args:
         module_name: Name of the module
         prompt_name: Name of the prompt template
@@ -77,33 +83,47 @@ def get_prompt_template(
     Raises:
         ConfigError: If the prompts file is missing or the template is not found
     """
-    # Import here to avoid circular import
-    import yaml
-    
-    if not prompts_file.exists():
-        raise ConfigError(f"Prompts file not found: {prompts_file}")
-    
-    try:
-        with open(prompts_file, "r", encoding="utf-8") as f:
-            prompts_data = yaml.safe_load(f)
-            prompts = prompts_data.get('prompts', {})
-    except Exception as e:
-        raise ConfigError(f"Error loading prompts file {prompts_file}: {e}")
-    
-    if not prompts:
-        raise ConfigError(f"No prompts found in {prompts_file}")
-
-    prompt_data = prompts.get(prompt_name)
-    if not prompt_data:
-        raise ConfigError(f"Prompt '{prompt_name}' not found in prompts")
+    # Parsed prompts are cached until the file's modification time or size changes
+    prompts = load_prompts(prompts_file)
 
-    template = prompt_data.get("template")
+    template = prompts.get(prompt_name)
     if not template:
         raise ConfigError(f"Template not found for prompt '{prompt_name}'")
 
     return template
 
 
+def resolve_prompt_template(
+    module_name: str,
+    prompt_template_name: str,
+    prompts_file: Optional[Union[str, Path]] = None
+) -> str:
+    """
+    Get a prompt template by name from a prompts file or the module's default one.
+    
+    Args:
+        module_name: Name of the module
+        prompt_template_name: Name of the prompt template
+        prompts_file: Optional specific prompts file path
+        
+    Returns:
+        str: The prompt template text
+        
+    Raises:
+        ConfigError: If the prompts file is missing or the template is not found
+    """
+    if not prompts_file:
+        # If prompts file not provided, use module's config path
+        module_dir = Path(__file__).resolve().parent.parent.parent
+        prompts_file = resolve_path(f"{module_name}/config/prompts.yaml", module_dir)
+        
+    return get_prompt_template(
+        module_name=module_name,
+        prompt_name=prompt_template_name,
+        prompts_file=Path(prompts_file) if isinstance(prompts_file, str) else prompts_file
+    )
+
+
 def process_with_assistant(
     input_text: str,
     module_name: str,
@@ -134,36 +154,279 @@ def process_with_assistant(
         ConfigError: If configuration is missing or invalid
         AssistantClientError: If processing fails
     """
-    # Create the client
+    # Get the prompt template if specified by name
+    if prompt_template_name and not prompt_template:
+        prompt_template = resolve_prompt_template(module_name, prompt_template_name, prompts_file)
+    
+    # Create the client; new assistant and thread IDs are saved on exit
+    with create_client(
+        module_name=module_name,
+        assistant_name=assistant_name,
+        config_file=config_file
+    ) as client:
+        # If we have a prompt template, use it
+        if prompt_template:
+            return client.process_with_prompt_template(
+                input_text=input_text,
+                prompt_template=prompt_template,
+                template_vars=template_vars
+            )
+        
+        # Otherwise just use the input text directly
+        return client.run_assistant(prompt=input_text)
+
+
+def process_many_with_assistant(
+    inputs: List[str],
+    module_name: str,
+    assistant_name: Optional[str] = None,
+    prompt_template_name: Optional[str] = None,
+    prompt_template: Optional[str] = None,
+    template_vars: Optional[Dict[str, Any]] = None,
+    config_file: Optional[Union[str, Path]] = None,
+    prompts_file: Optional[Union[str, Path]] = None,
+    concurrency: int = 10,
+    batch_size: Optional[int] = None
+) -> List[Union[Optional[str], BaseException]]:
+    """
+    Process several input texts with an OpenAI assistant.
+    
+    Inputs run concurrently, one request each. With batch_size, inputs
+    are instead bundled into requests of up to batch_size items, sent one
+    after another.
+    
+    Args:
+        inputs: The texts to process
+        module_name: Name of the module this assistant belongs to
+        assistant_name: Optional specific assistant name
+        prompt_template_name: Optional name of a prompt template to use
+        prompt_template: Optional explicit prompt template string
+        template_vars: Optional variables for prompt template
+        config_file: Optional specific config file path
+        prompts_file: Optional specific prompts file path
+        concurrency: Maximum number of concurrent assistant runs
+        batch_size: Optional number of inputs to bundle into each request
+        
+    Returns:
+        List: The response for each input, in order, or the exception
+        raised while processing it
+        
+    Raises:
+        ConfigError: If configuration is missing or invalid
+    """
     client = create_client(
         module_name=module_name,
         assistant_name=assistant_name,
         config_file=config_file
     )
     
-    # Get the prompt template if specified by name
     if prompt_template_name and not prompt_template:
-        if not prompts_file:
-            # If prompts file not provided, use module's config path
-            module_dir = Path(__file__).resolve().parent.parent.parent
-            prompts_file = resolve_path(f"{module_name}/config/prompts.yaml", module_dir)
-            
-        prompt_template = get_prompt_template(
-            module_name=module_name,
-            prompt_name=prompt_template_name,
-            prompts_file=Path(prompts_file) if isinstance(prompts_file, str) else prompts_file
-        )
+        prompt_template = resolve_prompt_template(module_name, prompt_template_name, prompts_file)
+    
+    if batch_size:
+        with client:
+            return client.process_many(
+                inputs,
+                prompt_template=prompt_template or "{input_text}",
+                template_vars=template_vars,
+                batch_size=batch_size
+            )
+    
+    if prompt_template:
+        prompts = [
+            client.format_prompt(text, prompt_template, dict(template_vars or {}))
+            for text in inputs
+        ]
+    else:
+        prompts = list(inputs)
+    
+    with client:
+        return asyncio.run(client.run_many(prompts, concurrency=concurrency))
+
+
+def _batch_config_key(client: OpenAIAssistantClient) -> str:
+    """
+    Get the config key under which the assistant's last batch ID is stored.
+    
+    Args:
+        client: The assistant client
+        
+    Returns:
+        str: The config key
+    """
+    return f"batch_id_{client._norm_name}"
+
+
+def submit_batch_with_assistant(
+    inputs: List[str],
+    module_name: str,
+    assistant_name: Optional[str] = None,
+    prompt_template_name: Optional[str] = None,
+    prompt_template: Optional[str] = None,
+    template_vars: Optional[Dict[str, Any]] = None,
+    config_file: Optional[Union[str, Path]] = None,
+    prompts_file: Optional[Union[str, Path]] = None
+) -> str:
+    """
+    Submit input texts as an OpenAI batch job using the assistant's settings.
+    
+    The batch ID is saved to the module's assistant config so that it can
+    be collected later without passing it explicitly.
+    
+    Args:
+        inputs: The texts to process
+        module_name: Name of the module this assistant belongs to
+        assistant_name: Optional specific assistant name
+        prompt_template_name: Optional name of a prompt template to use
+        prompt_template: Optional explicit prompt template string
+        template_vars: Optional variables for prompt template
+        config_file: Optional specific config file path
+        prompts_file: Optional specific prompts file path
+        
+    Returns:
+        str: The batch ID
+        
+    Raises:
+        ConfigError: If configuration is missing or invalid
+        BatchError: If the batch cannot be submitted
+    """
+    client = create_client(
+        module_name=module_name,
+        assistant_name=assistant_name,
+        config_file=config_file
+    )
+    
+    if prompt_template_name and not prompt_template:
+        prompt_template = resolve_prompt_template(module_name, prompt_template_name, prompts_file)
     
-    # If we have a prompt template, use it
     if prompt_template:
-        return client.process_with_prompt_template(
-            input_text=input_text,
-            prompt_template=prompt_template,
-            template_vars=template_vars
-        )
+        prompts = [
+            client.format_prompt(text, prompt_template, dict(template_vars or {}))
+            for text in inputs
+        ]
+    else:
+        prompts = list(inputs)
+    
+    response_format = None
+    if client.config.get("default_response_format") == "json":
+        response_format = {"type": "json_object"}
+    
+    batch_id = submit_batch(
+        client.client,
+        prompts,
+        model=client.model_name,
+        instructions=client.instructions,
+        temperature=client.config.get("temperature"),
+        response_format=response_format,
+        metadata={"module": module_name, "assistant": client.assistant_name}
+    )
+    
+    client.set_config_value(_batch_config_key(client), batch_id)
+    client.flush()
+    return batch_id
+
+
+def collect_batch_results(
+    module_name: str,
+    assistant_name: Optional[str] = None,
+    config_file: Optional[Union[str, Path]] = None,
+    batch_id: Optional[str] = None,
+    poll_interval: float = 30.0
+) -> List[Dict[str, Any]]:
+    """
+    Wait for a batch job and get its results.
+    
+    Args:
+        module_name: Name of the module this assistant belongs to
+        assistant_name: Optional specific assistant name
+        config_file: Optional specific config file path
+        batch_id: Batch ID (defaults to the last one submitted for the assistant)
+        poll_interval: Seconds between status checks
+        
+    Returns:
+        List: One dict per input, in order, with "index" and either
+        "response" or "error"
+        
+    Raises:
+        ConfigError: If configuration is missing or no batch ID is known
+        BatchError: If the batch failed or its results cannot be downloaded
+    """
+    client = create_client(
+        module_name=module_name,
+        assistant_name=assistant_name,
+        config_file=config_file
+    )
+    
+    batch_id = batch_id or client.config.get(_batch_config_key(client))
+    if not batch_id:
+        raise ConfigError("No batch ID given and none saved for this assistant")
+    
+    results = []
+    for index, response, error in collect_batch(client.client, batch_id, poll_interval):
+        if error is not None:
+            results.append({"index": index, "error": error})
+        else:
+            results.append({"index": index, "response": response})
+    return results
+
+
+def serve(
+    module_name: str,
+    assistant_name: Optional[str] = None,
+    config_file: Optional[Union[str, Path]] = None,
+    prompts_file: Optional[Union[str, Path]] = None,
+    input_stream=None,
+    output_stream=None
+) -> None:
+    """
+    Answer JSON requests, one per line, until the input ends.
+    
+    Each request is an object with "input" and an optional "prompt"
+    template name. Each reply is written as one JSON line with either
+    "response" or "error". A single client is kept for the whole session,
+    so startup and HTTPS connections are reused across requests.
+    
+    Args:
+        module_name: Name of the module this assistant belongs to
+        assistant_name: Optional specific assistant name
+        config_file: Optional specific config file path
+        prompts_file: Optional specific prompts file path
+        input_stream: Stream to read requests from (default: stdin)
+        output_stream: Stream to write replies to (default: stdout)
+        
+    Raises:
+        ConfigError: If configuration is missing or invalid
+    """
+    input_stream = input_stream or sys.stdin
+    output_stream = output_stream or sys.stdout
     
-    # Otherwise just use the input text directly
-    return client.run_assistant(prompt=input_text)
+    with create_client(
+        module_name=module_name,
+        assistant_name=assistant_name,
+        config_file=config_file
+    ) as client:
+        for line in iter(input_stream.readline, ""):
+            if not line.strip():
+                continue
+            
+            try:
+                request = json.loads(line)
+                input_text = request["input"]
+                if request.get("prompt"):
+                    prompt_template = resolve_prompt_template(module_name, request["prompt"], prompts_file)
+                    response = client.process_with_prompt_template(
+                        input_text=input_text,
+                        prompt_template=prompt_template
+                    )
+                else:
+                    response = client.run_assistant(prompt=input_text)
+                reply = {"response": response}
+            except Exception as e:
+                logger.error(f"Error serving request: {e}")
+                reply = {"error": str(e)}
+            
+            output_stream.write(json.dumps(reply, ensure_ascii=False) + "\n")
+            output_stream.flush()
 
 
 def main():
@@ -185,11 +448,38 @@ def main():
     process_parser.add_argument("--file", "-f", action="store_true", help="Input is a file path")
     process_parser.add_argument("--output", "-o", help="Output file path")
     process_parser.add_argument("--prompts-file", help="Path to prompts file")
+    process_parser.add_argument("--lines", action="store_true",
+                                help="Process each non-empty input line separately, writing one JSON result per line")
+    process_parser.add_argument("--concurrency", type=int, default=10,
+                                help="Maximum concurrent assistant runs with --lines (default: 10)")
+    process_parser.add_argument("--batch-size", type=int,
+                                help="With --lines, bundle this many lines into each assistant request")
+    
+    # Batch command
+    batch_parser = subparsers.add_parser("batch", help="Submit each input line as an OpenAI batch request")
+    batch_parser.add_argument("input", nargs="?", help="Input file path (reads stdin if omitted)")
+    batch_parser.add_argument("--prompt", "-p", help="Prompt template name")
+    batch_parser.add_argument("--prompts-file", help="Path to prompts file")
+    
+    # Collect command
+    collect_parser = subparsers.add_parser("collect", help="Wait for a batch and write its results")
+    collect_parser.add_argument("--id", help="Batch ID (defaults to the last one submitted)")
+    collect_parser.add_argument("--output", "-o", help="Output file path")
+    collect_parser.add_argument("--poll-interval", type=float, default=30.0,
+                                help="Seconds between batch status checks (default: 30)")
+    
+    # Serve command
+    serve_parser = subparsers.add_parser("serve", help="Answer JSON requests read line by line from stdin")
+    serve_parser.add_argument("--prompts-file", help="Path to prompts file")
     
     # Delete command
     delete_parser = subparsers.add_parser("delete", help="Delete an assistant")
     delete_parser.add_argument("--id", help="Specific assistant ID to delete")
     
+    # Compile prompts command
+    compile_parser = subparsers.add_parser("compile-prompts", help="Convert the module's prompts.yaml to JSON")
+    compile_parser.add_argument("--prompts-file", help="Path to prompts file")
+    
     args = parser.parse_args()
     
     try:
@@ -204,38 +494,110 @@ def main():
                 # Read from stdin if no input provided
                 input_text = sys.stdin.read()
             
-            # Process the input
-            response = process_with_assistant(
-                input_text=input_text,
+            if args.lines:
+                # Process each line concurrently
+                inputs = [line for line in input_text.splitlines() if line.strip()]
+                results = process_many_with_assistant(
+                    inputs=inputs,
+                    module_name=args.module,
+                    assistant_name=args.assistant,
+                    prompt_template_name=args.prompt,
+                    config_file=args.config,
+                    prompts_file=args.prompts_file,
+                    concurrency=args.concurrency,
+                    batch_size=args.batch_size
+                )
+                
+                lines = []
+                for text, result in zip(inputs, results):
+                    if isinstance(result, BaseException):
+                        logger.error(f"Error processing input line: {result}")
+                        lines.append(json.dumps({"input": text, "error": str(result)}, ensure_ascii=False))
+                    else:
+                        lines.append(json.dumps({"input": text, "response": result}, ensure_ascii=False))
+                response = "\n".join(lines)
+            else:
+                # Process the input
+                response = process_with_assistant(
+                    input_text=input_text,
+                    module_name=args.module,
+                    assistant_name=args.assistant,
+                    prompt_template_name=args.prompt,
+                    config_file=args.config,
+                    prompts_file=args.prompts_file
+                )
+            
+            # Output the response
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    f.write(response)
+            else:
+                print(response)
+                
+        elif args.command == "batch":
+            if args.input:
+                with open(args.input, "r", encoding="utf-8") as f:
+                    input_text = f.read()
+            else:
+                input_text = sys.stdin.read()
+            
+            batch_id = submit_batch_with_assistant(
+                inputs=[line for line in input_text.splitlines() if line.strip()],
                 module_name=args.module,
                 assistant_name=args.assistant,
                 prompt_template_name=args.prompt,
                 config_file=args.config,
                 prompts_file=args.prompts_file
             )
+            print(batch_id)
+            
+        elif args.command == "collect":
+            results = collect_batch_results(
+                module_name=args.module,
+                assistant_name=args.assistant,
+                config_file=args.config,
+                batch_id=args.id,
+                poll_interval=args.poll_interval
+            )
+            output = "\n".join(json.dumps(result, ensure_ascii=False) for result in results)
             
-            # Output the response
             if args.output:
                 with open(args.output, "w", encoding="utf-8") as f:
-                    f.write(response)
+                    f.write(output)
             else:
-                print(response)
+                print(output)
                 
+        elif args.command == "serve":
+            serve(
+                module_name=args.module,
+                assistant_name=args.assistant,
+                config_file=args.config,
+                prompts_file=args.prompts_file
+            )
+            
         elif args.command == "delete":
             # Create client
-            client = create_client(
+            with create_client(
                 module_name=args.module,
                 assistant_name=args.assistant,
                 config_file=args.config
-            )
-            
-            # Delete the assistant
-            success = client.delete_assistant(args.id if args.id else None)
+            ) as client:
+                # Delete the assistant
+                success = client.delete_assistant(args.id if args.id else None)
             if success:
                 print("Assistant deleted successfully")
             else:
                 print("Failed to delete assistant")
                 
+        elif args.command == "compile-prompts":
+            if args.prompts_file:
+                prompts_path = resolve_path(args.prompts_file)
+            else:
+                prompts_path = get_module_dir(args.module) / "config" / "prompts.yaml"
+            
+            json_path = compile_prompts_file(prompts_path)
+            print(f"Compiled prompts written to {json_path}")
+                
         else:
             parser.print_help()
             sys.exit(1)
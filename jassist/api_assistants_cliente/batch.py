@@ -0,0 +1,220 @@
+"""
+OpenAI Batch API support.
+
+This module submits many prompts as a single OpenAI batch job and collects
+the results once the job finishes. Batches are billed at a discount and use
+a separate rate-limit pool, which suits bulk workloads that can wait.
+
+The Batch API does not run assistants, so each prompt becomes a chat
+completion request using the assistant's model and instructions.
+"""
+
+import io
+import json
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from openai import OpenAI
+
+from jassist.logger_utils.logger_utils import setup_logger
+from jassist.api_assistants_cliente.exceptions import BatchError
+
+logger = setup_logger("batch", module="api_assistants_cliente")
+
+# Endpoint every batch request is sent to
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# Batch statuses after which the job no longer changes
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+def _custom_id(index: int) -> str:
+    """
+    Build the ID of a batch request from the prompt's position.
+
+    Args:
+        index: Position of the prompt in the submitted list
+
+    Returns:
+        str: The request's custom ID
+    """
+    return f"request-{index}"
+
+def _request_index(custom_id: str) -> int:
+    """
+    Get the prompt position back from a batch request ID.
+
+    Args:
+        custom_id: The request's custom ID
+
+    Returns:
+        int: Position of the prompt in the submitted list
+    """
+    return int(custom_id.rsplit("-", 1)[-1])
+
+def build_batch_file(
+    prompts: List[str],
+    model: str,
+    instructions: Optional[str] = None,
+    temperature: Optional[float] = None,
+    response_format: Optional[Dict[str, Any]] = None
+) -> io.BytesIO:
+    """
+    Build the JSONL input file of a batch in memory.
+
+    Args:
+        prompts: User prompts, one request each
+        model: Model to run the requests with
+        instructions: Optional system instructions added to every request
+        temperature: Optional sampling temperature
+        response_format: Optional response format, e.g. {"type": "json_object"}
+
+    Returns:
+        io.BytesIO: The JSONL file, named so the upload has a .jsonl extension
+    """
+    lines = []
+    for index, prompt in enumerate(prompts):
+        messages = []
+        if instructions:
+            messages.append({"role": "system", "content": instructions})
+        messages.append({"role": "user", "content": prompt})
+
+        body: Dict[str, Any] = {"model": model, "messages": messages}
+        if temperature is not None:
+            body["temperature"] = temperature
+        if response_format:
+            body["response_format"] = response_format
+
+        lines.append(json.dumps({
+            "custom_id": _custom_id(index),
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": body
+        }, ensure_ascii=False))
+
+    batch_file = io.BytesIO(("\n".join(lines) + "\n").encode("utf-8"))
+    batch_file.name = "batch_input.jsonl"
+    return batch_file
+
+def submit_batch(
+    client: OpenAI,
+    prompts: List[str],
+    model: str,
+    instructions: Optional[str] = None,
+    temperature: Optional[float] = None,
+    response_format: Optional[Dict[str, Any]] = None,
+    metadata: Optional[Dict[str, str]] = None
+) -> str:
+    """
+    Submit prompts as a batch job.
+
+    Args:
+        client: OpenAI client instance
+        prompts: User prompts, one request each
+        model: Model to run the requests with
+        instructions: Optional system instructions added to every request
+        temperature: Optional sampling temperature
+        response_format: Optional response format, e.g. {"type": "json_object"}
+        metadata: Optional metadata stored with the batch
+
+    Returns:
+        str: The batch ID
+
+    Raises:
+        BatchError: If there are no prompts or the upload or batch creation fails
+    """
+    if not prompts:
+        raise BatchError("No prompts to submit")
+
+    batch_file = build_batch_file(prompts, model, instructions, temperature, response_format)
+
+    try:
+        input_file = client.files.create(file=batch_file, purpose="batch")
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window="24h",
+            metadata=metadata
+        )
+    except Exception as e:
+        error_msg = f"Failed to submit batch: {e}"
+        logger.error(error_msg)
+        raise BatchError(error_msg)
+
+    logger.info(f"Submitted batch {batch.id} with {len(prompts)} requests")
+    return batch.id
+
+def wait_for_batch(client: OpenAI, batch_id: str, poll_interval: float = 30.0) -> Any:
+    """
+    Wait until a batch job reaches a terminal status.
+
+    Args:
+        client: OpenAI client instance
+        batch_id: The batch ID
+        poll_interval: Seconds between status checks
+
+    Returns:
+        Batch: The batch in its terminal status
+
+    Raises:
+        BatchError: If the batch cannot be retrieved
+    """
+    while True:
+        try:
+            batch = client.batches.retrieve(batch_id)
+        except Exception as e:
+            error_msg = f"Failed to retrieve batch {batch_id}: {e}"
+            logger.error(error_msg)
+            raise BatchError(error_msg)
+
+        if batch.status in TERMINAL_STATUSES:
+            logger.info(f"Batch {batch_id} finished with status {batch.status}")
+            return batch
+
+        logger.debug(f"Batch {batch_id} is {batch.status}, checking again in {poll_interval}s")
+        time.sleep(poll_interval)
+
+def collect_batch(
+    client: OpenAI,
+    batch_id: str,
+    poll_interval: float = 30.0
+) -> Iterator[Tuple[int, Optional[str], Optional[str]]]:
+    """
+    Wait for a batch job and yield its results in prompt order.
+
+    Args:
+        client: OpenAI client instance
+        batch_id: The batch ID
+        poll_interval: Seconds between status checks
+
+    Yields:
+        Tuple: (prompt position, response text or None, error message or None)
+
+    Raises:
+        BatchError: If the batch did not complete or its results cannot be downloaded
+    """
+    batch = wait_for_batch(client, batch_id, poll_interval)
+    if batch.status != "completed":
+        raise BatchError(f"Batch {batch_id} ended with status {batch.status}")
+
+    results = []
+    try:
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                content = client.files.content(file_id).text
+                results.extend(json.loads(line) for line in content.splitlines() if line.strip())
+    except Exception as e:
+        error_msg = f"Failed to download results of batch {batch_id}: {e}"
+        logger.error(error_msg)
+        raise BatchError(error_msg)
+
+    # Output lines are not guaranteed to follow the input order
+    results.sort(key=lambda result: _request_index(result["custom_id"]))
+
+    for result in results:
+        index = _request_index(result["custom_id"])
+        response = result.get("response") or {}
+        if result.get("error") or response.get("status_code") != 200:
+            error = result.get("error") or response.get("body", {}).get("error")
+            yield index, None, str(error)
+        else:
+            yield index, response["body"]["choices"][0]["message"]["content"], None
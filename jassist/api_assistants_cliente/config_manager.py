@@ -6,18 +6,26 @@ This module provides functions for loading and managing assistant configurations
 
 import os
 import json
-import yaml
 from pathlib import Path
 from typing import Dict, Any, Optional, Union
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from jassist.logger_utils.logger_utils import setup_logger
 from jassist.api_assistants_cliente.exceptions import ConfigError
 from jassist.utils.path_utils import resolve_path
 
+# Optional faster JSON parser
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = setup_logger("config_manager", module="api_assistants_cliente")
 
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
 def get_script_dir() -> Path:
     """
     Get the directory of the current script, handling both frozen and regular execution.
@@ -95,8 +103,7 @@ def load_json_config(filepath: Path) -> Dict[str, Any]:
     
     # Load the file
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return _json_loads(filepath.read_bytes())
     except json.JSONDecodeError as e:
         error_msg = f"Error parsing JSON in {filepath}: {e}"
         logger.error(error_msg)
@@ -107,6 +114,27 @@ def load_json_config(filepath: Path) -> Dict[str, Any]:
         raise ConfigError(error_msg)
 
 
+def _load_yaml_file(filepath: Path) -> Any:
+    """
+    Parse a YAML file with the fastest safe loader available.
+    
+    The libyaml-backed CSafeLoader is used when PyYAML was built with it,
+    falling back to the pure-Python SafeLoader otherwise.
+    
+    Args:
+        filepath: Path to the YAML file
+        
+    Returns:
+        Any: The parsed document
+    """
+    # Imported here so modules that only read JSON never load PyYAML
+    import yaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    
+    # libyaml decodes the bytes itself
+    return yaml.load(filepath.read_bytes(), Loader=loader)
+
+
 def load_yaml_config(filepath: Path) -> Dict[str, Any]:
     """
     Load a YAML configuration file.
@@ -120,14 +148,16 @@ def load_yaml_config(filepath: Path) -> Dict[str, Any]:
     Raises:
         ConfigError: If the file doesn't exist or has parsing errors
     """
+    # Imported here so modules that only read JSON never load PyYAML
+    import yaml
+    
     # Check if file exists
     if not filepath.exists():
         raise ConfigError(f"Config file not found: {filepath}")
     
     # Load the file
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+        return _load_yaml_file(filepath)
     except yaml.YAMLError as e:
         error_msg = f"Error parsing YAML in {filepath}: {e}"
         logger.error(error_msg)
@@ -138,6 +168,55 @@ def load_yaml_config(filepath: Path) -> Dict[str, Any]:
         raise ConfigError(error_msg)
 
 
+def compile_prompts_file(prompts_path: Path) -> Path:
+    """
+    Convert a prompts YAML file into a JSON file next to it.
+    
+    Adapters prefer the JSON copy while it is at least as new as the YAML
+    file, which skips YAML parsing at startup.
+    
+    Args:
+        prompts_path: Path to the prompts YAML file
+        
+    Returns:
+        Path: Path to the written JSON file
+        
+    Raises:
+        ConfigError: If the file is not YAML or cannot be converted
+    """
+    if prompts_path.suffix.lower() not in ('.yaml', '.yml'):
+        raise ConfigError(f"Prompts file is not YAML: {prompts_path}")
+    
+    json_path = prompts_path.with_suffix('.json')
+    save_json_config(load_yaml_config(prompts_path), json_path)
+    logger.info(f"Compiled prompts {prompts_path} -> {json_path}")
+    return json_path
+
+
+def load_compiled_prompts(prompts_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Load the compiled JSON copy of a prompts YAML file, if it is current.
+    
+    Args:
+        prompts_path: Path to the prompts YAML file
+        
+    Returns:
+        Dict: Prompts dictionary, or None if there is no up-to-date JSON copy
+    """
+    if prompts_path.suffix.lower() not in ('.yaml', '.yml'):
+        return None
+    
+    json_path = prompts_path.with_suffix('.json')
+    try:
+        if json_path.stat().st_mtime_ns < prompts_path.stat().st_mtime_ns:
+            logger.debug(f"Compiled prompts {json_path} are older than the YAML file, ignoring")
+            return None
+    except FileNotFoundError:
+        return None
+    
+    return load_json_config(json_path).get('prompts')
+
+
 def save_json_config(config: Dict[str, Any], filepath: Path) -> bool:
     """
     Save a configuration to a JSON file.
@@ -282,8 +361,7 @@ def load_prompt_templates(
         prompts_path = Path(prompts_file) if isinstance(prompts_file, str) else prompts_file
         try:
             if prompts_path.suffix.lower() in ('.yaml', '.yml'):
-                with open(prompts_path, "r", encoding="utf-8") as f:
-                    return yaml.safe_load(f).get('prompts', {})
+                return _load_yaml_file(prompts_path).get('prompts', {})
             else:
                 with open(prompts_path, "r", encoding="utf-8") as f:
                     return json.load(f).get('prompts', {})
@@ -297,11 +375,10 @@ def load_prompt_templates(
         module_prompts_path = module_dir / "config" / "prompts.yaml"
         if module_prompts_path.exists():
             try:
-                with open(module_prompts_path, "r", encoding="utf-8") as f:
-                    prompts = yaml.safe_load(f).get('prompts', {})
-                    if prompts:
-                        logger.info(f"Loaded prompts from module directory: {module_prompts_path}")
-                        return prompts
+                prompts = _load_yaml_file(module_prompts_path).get('prompts', {})
+                if prompts:
+                    logger.info(f"Loaded prompts from module directory: {module_prompts_path}")
+                    return prompts
             except Exception as e:
                 logger.warning(f"Error loading module prompts from {module_prompts_path}: {e}")
     
@@ -310,11 +387,10 @@ def load_prompt_templates(
         # First try in a module-specific subdirectory
         module_prompts_path = base_config_dir / module_name / "prompts.yaml"
         if module_prompts_path.exists():
-            with open(module_prompts_path, "r", encoding="utf-8") as f:
-                prompts = yaml.safe_load(f).get('prompts', {})
-                if prompts:
-                    logger.info(f"Loaded prompts from module-specific subdirectory")
-                    return prompts
+            prompts = _load_yaml_file(module_prompts_path).get('prompts', {})
+            if prompts:
+                logger.info(f"Loaded prompts from module-specific subdirectory")
+                return prompts
     except Exception as e:
         logger.debug(f"No module prompts found in {module_prompts_path}: {e}")
     
@@ -322,11 +398,10 @@ def load_prompt_templates(
     try:
         global_prompts_path = base_config_dir / "prompts.yaml"
         if global_prompts_path.exists():
-            with open(global_prompts_path, "r", encoding="utf-8") as f:
-                prompts = yaml.safe_load(f).get('prompts', {})
-                if prompts:
-                    logger.info(f"Loaded prompts from global file")
-                    return prompts
+            prompts = _load_yaml_file(global_prompts_path).get('prompts', {})
+            if prompts:
+                logger.info(f"Loaded prompts from global file")
+                return prompts
     except Exception as e:
         logger.warning(f"Could not load global prompts: {e}")
     
@@ -382,6 +457,27 @@ def save_assistant_config(
         raise ConfigError(f"Error saving config file: {e}")
 
 
+def created_at_epoch(value: Any) -> Optional[float]:
+    """
+    Get a thread creation time stored in a config as epoch seconds.
+    
+    Creation times are stored as epoch seconds; configs written by older
+    versions hold ISO 8601 strings, which are converted.
+    
+    Args:
+        value: The stored creation time
+        
+    Returns:
+        float: Epoch seconds, or None if the value cannot be parsed
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (ValueError, TypeError):
+        return None
+
+
 def cleanup_thread_config(
     module_name: str,
     assistant_name: str = None,
@@ -419,9 +515,8 @@ def cleanup_thread_config(
         # Keep track of keys to remove
         keys_to_remove = []
         
-        # Get current time for age comparison
-        now = datetime.now()
-        cutoff_date = now - timedelta(days=keep_days)
+        # Get the cutoff as epoch seconds for age comparison
+        cutoff = time.time() - keep_days * 86400
         
         # Find thread keys to clean up
         for key in list(config.keys()):
@@ -442,15 +537,12 @@ def cleanup_thread_config(
                 
                 # Check thread age
                 if created_at_key in config:
-                    try:
-                        created_at = datetime.fromisoformat(config[created_at_key])
-                        if created_at < cutoff_date:
-                            logger.debug(f"Removing old thread: {key} (created {created_at})")
-                            keys_to_remove.append(key)
-                            keys_to_remove.append(created_at_key)
-                    except (ValueError, TypeError):
-                        # If we can't parse the date, keep the entry
-                        pass
+                    # If we can't parse the date, keep the entry
+                    created_at = created_at_epoch(config[created_at_key])
+                    if created_at is not None and created_at < cutoff:
+                        logger.debug(f"Removing old thread: {key} (created {datetime.fromtimestamp(created_at)})")
+                        keys_to_remove.append(key)
+                        keys_to_remove.append(created_at_key)
         
         # Remove the identified keys
         for key in keys_to_remove:
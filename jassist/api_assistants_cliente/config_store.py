@@ -0,0 +1,172 @@
+"""
+SQLite store for assistant and thread IDs.
+
+Saving IDs in the JSON config rewrites the whole file on every change, and
+concurrent processes sharing one config overwrite each other's updates.
+This store keeps the IDs in a SQLite database in WAL mode instead, where
+each change is a single-row write that concurrent processes can make safely.
+"""
+
+import functools
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from jassist.logger_utils.logger_utils import setup_logger
+from jassist.api_assistants_cliente.exceptions import ConfigError
+
+logger = setup_logger("config_store", module="api_assistants_cliente")
+
+# Memory-mapped I/O size for reads, in bytes
+MMAP_SIZE = 64 * 1024 * 1024
+
+# Seconds a write waits for another process's write lock
+BUSY_TIMEOUT = 30.0
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS assistants (name TEXT PRIMARY KEY, id TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS threads (key TEXT PRIMARY KEY, id TEXT NOT NULL, created_at REAL NOT NULL)",
+)
+
+class SqliteConfigStore:
+    """
+    Assistant IDs by assistant name and thread IDs by thread key, in SQLite.
+
+    One connection is opened per process and shared by its threads under a
+    lock. A process forked after the connection was opened opens its own.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize the store. The database is opened on first use.
+
+        Args:
+            db_path: Path to the SQLite database file (created if missing)
+        """
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Get this process's connection, opening it if needed. Caller holds the lock.
+
+        Returns:
+            sqlite3.Connection: Connection in autocommit mode
+        """
+        pid = os.getpid()
+        if self._conn is None or self._pid != pid:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=BUSY_TIMEOUT,
+                isolation_level=None,
+                check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            self._conn, self._pid = conn, pid
+            logger.debug(f"Opened config store {self.db_path}")
+        return self._conn
+
+    def _execute(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        """
+        Run one statement.
+
+        Args:
+            sql: SQL statement
+            params: Statement parameters
+
+        Returns:
+            List: Result rows
+
+        Raises:
+            ConfigError: If the database cannot be opened or the statement fails
+        """
+        with self._lock:
+            try:
+                return self._connection().execute(sql, params).fetchall()
+            except sqlite3.Error as e:
+                raise ConfigError(f"Config store error in {self.db_path}: {e}")
+
+    def get_assistant_id(self, name: str) -> Optional[str]:
+        """
+        Get the saved ID of an assistant.
+
+        Args:
+            name: Normalized assistant name
+
+        Returns:
+            str: Assistant ID, or None if none is saved
+        """
+        rows = self._execute("SELECT id FROM assistants WHERE name = ?", (name,))
+        return rows[0][0] if rows else None
+
+    def set_assistant_id(self, name: str, assistant_id: Optional[str]) -> None:
+        """
+        Save or remove the ID of an assistant.
+
+        Args:
+            name: Normalized assistant name
+            assistant_id: Assistant ID, or None to remove it
+        """
+        if assistant_id is None:
+            self._execute("DELETE FROM assistants WHERE name = ?", (name,))
+        else:
+            self._execute("INSERT OR REPLACE INTO assistants (name, id) VALUES (?, ?)", (name, assistant_id))
+
+    def get_thread(self, key: str) -> Optional[Tuple[str, float]]:
+        """
+        Get a saved thread.
+
+        Args:
+            key: Full thread key
+
+        Returns:
+            Tuple: (thread ID, creation time as epoch seconds), or None if none is saved
+        """
+        rows = self._execute("SELECT id, created_at FROM threads WHERE key = ?", (key,))
+        return rows[0] if rows else None
+
+    def set_thread(self, key: str, thread_id: str, created_at: float) -> None:
+        """
+        Save a thread.
+
+        Args:
+            key: Full thread key
+            thread_id: Thread ID
+            created_at: Creation time as epoch seconds
+        """
+        self._execute(
+            "INSERT OR REPLACE INTO threads (key, id, created_at) VALUES (?, ?, ?)",
+            (key, thread_id, created_at)
+        )
+
+    def close(self) -> None:
+        """
+        Close this process's connection.
+        """
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._pid = None
+
+@functools.lru_cache(maxsize=4)
+def get_config_store(db_path: str) -> SqliteConfigStore:
+    """
+    Get the process-wide store for a database file.
+
+    Args:
+        db_path: Absolute path to the SQLite database file
+
+    Returns:
+        SqliteConfigStore: The store
+    """
+    return SqliteConfigStore(Path(db_path))
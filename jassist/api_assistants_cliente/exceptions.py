@@ -24,4 +24,9 @@ class ThreadError(AssistantClientError):
 
 class RunError(AssistantClientError):
     """Error related to run operations."""
-    pass 
\ No newline at end of file
+    pass 
+
+
+class BatchError(AssistantClientError):
+    """Error related to batch operations."""
+    pass
@@ -0,0 +1,38 @@
+"""
+Backoff intervals for polling assistant runs.
+
+Runs usually finish within a few seconds, so polling starts fast and backs
+off while a run is still going, instead of waiting a fixed interval.
+"""
+
+from typing import Iterator
+
+# Seconds before the first status check
+POLL_INTERVAL_INITIAL = 0.2
+
+# Longest wait between status checks, in seconds
+POLL_INTERVAL_MAX = 2.0
+
+# Factor the wait grows by after each check
+POLL_BACKOFF_FACTOR = 1.3
+
+def poll_intervals(
+    initial: float = POLL_INTERVAL_INITIAL,
+    maximum: float = POLL_INTERVAL_MAX,
+    factor: float = POLL_BACKOFF_FACTOR
+) -> Iterator[float]:
+    """
+    Yield the seconds to wait before each status check.
+
+    Args:
+        initial: First wait
+        maximum: Longest wait
+        factor: Factor the wait grows by after each check
+
+    Yields:
+        float: Seconds to wait before the next check
+    """
+    interval = initial
+    while True:
+        yield interval
+        interval = min(interval * factor, maximum)
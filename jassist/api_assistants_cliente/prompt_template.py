@@ -0,0 +1,88 @@
+"""
+Pre-parsed prompt templates.
+
+This module parses str.format-style prompt templates once, so rendering a
+template used for many inputs only substitutes values instead of parsing
+the format string on every call.
+"""
+
+import functools
+import string
+from typing import Any, List, Mapping, Optional, Tuple
+
+# Maximum number of distinct template strings kept parsed
+MAX_CACHED_TEMPLATES = 64
+
+_FORMATTER = string.Formatter()
+
+class PromptTemplate:
+    """
+    A prompt template split into literal text and named fields.
+
+    Rendering gives the same result as str.format with keyword arguments.
+    Templates using positional fields, attribute or index lookups, format
+    specs or conversions are rendered with str.format itself.
+    """
+
+    __slots__ = ("source", "_parts", "_simple")
+
+    def __init__(self, source: str):
+        """
+        Parse a template.
+
+        Args:
+            source: Template string with {name} placeholders
+
+        Raises:
+            ValueError: If the template is not a valid format string
+        """
+        self.source = source
+        parts: List[Tuple[str, Optional[str]]] = []
+        simple = True
+        for literal, field_name, format_spec, conversion in _FORMATTER.parse(source):
+            if field_name is not None and (not field_name.isidentifier() or format_spec or conversion):
+                simple = False
+            parts.append((literal, field_name))
+        self._parts = tuple(parts)
+        self._simple = simple
+
+    def render(self, variables: Mapping[str, Any]) -> str:
+        """
+        Fill the template's fields.
+
+        Args:
+            variables: Value for each field name
+
+        Returns:
+            str: The rendered prompt
+
+        Raises:
+            KeyError: If a field has no value
+        """
+        if not self._simple:
+            return self.source.format(**variables)
+
+        pieces = []
+        for literal, field_name in self._parts:
+            if literal:
+                pieces.append(literal)
+            if field_name is not None:
+                value = variables[field_name]
+                pieces.append(value if type(value) is str else format(value))
+        return "".join(pieces)
+
+@functools.lru_cache(maxsize=MAX_CACHED_TEMPLATES)
+def compile_template(source: str) -> PromptTemplate:
+    """
+    Get the parsed form of a template string, parsing it on first use.
+
+    Args:
+        source: Template string with {name} placeholders
+
+    Returns:
+        PromptTemplate: The parsed template
+
+    Raises:
+        ValueError: If the template is not a valid format string
+    """
+    return PromptTemplate(source)
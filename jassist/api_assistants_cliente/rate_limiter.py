@@ -0,0 +1,234 @@
+"""
+Client-side rate limiting for OpenAI API requests.
+
+This module provides a token bucket that tracks requests and tokens per
+minute, so requests wait for capacity instead of bouncing off 429 errors.
+The buckets are corrected from the x-ratelimit-* headers of every
+response.
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from jassist.logger_utils.logger_utils import setup_logger
+
+logger = setup_logger("rate_limiter", module="api_assistants_cliente")
+
+# Limits assumed until the first response reports the real ones
+DEFAULT_REQUESTS_PER_MINUTE = 500
+DEFAULT_TOKENS_PER_MINUTE = 200000
+
+# Rough number of characters per token, used to estimate request sizes
+CHARS_PER_TOKEN = 4
+
+class RateLimiter:
+    """
+    Token bucket limiting both requests and tokens per minute.
+
+    Capacity refills continuously. acquire() blocks until both buckets can
+    cover the request; acquire_async() waits without blocking the event loop.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE
+    ):
+        """
+        Initialize the rate limiter with full buckets.
+
+        Args:
+            requests_per_minute: Maximum requests per minute
+            tokens_per_minute: Maximum tokens per minute
+        """
+        self.requests_per_minute = float(requests_per_minute)
+        self.tokens_per_minute = float(tokens_per_minute)
+        self._available_requests = self.requests_per_minute
+        self._available_tokens = self.tokens_per_minute
+        self._last_update = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """
+        Add the capacity regained since the last update. Caller holds the lock.
+
+        Args:
+            now: Current monotonic time
+        """
+        elapsed = now - self._last_update
+        self._available_requests = min(
+            self.requests_per_minute,
+            self._available_requests + elapsed * self.requests_per_minute / 60.0
+        )
+        self._available_tokens = min(
+            self.tokens_per_minute,
+            self._available_tokens + elapsed * self.tokens_per_minute / 60.0
+        )
+        self._last_update = now
+
+    def _reserve(self, tokens_estimate: int) -> float:
+        """
+        Take capacity for one request if both buckets can cover it.
+
+        Args:
+            tokens_estimate: Estimated tokens the request will consume
+
+        Returns:
+            float: 0 if the capacity was taken, otherwise seconds to wait before retrying
+        """
+        # A request larger than the whole bucket is let through once it is full
+        tokens = min(float(tokens_estimate), self.tokens_per_minute)
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._available_requests >= 1 and self._available_tokens >= tokens:
+                self._available_requests -= 1
+                self._available_tokens -= tokens
+                return 0.0
+
+            request_wait = (1 - self._available_requests) * 60.0 / self.requests_per_minute
+            token_wait = (tokens - self._available_tokens) * 60.0 / self.tokens_per_minute
+            return max(request_wait, token_wait, 0.001)
+
+    def acquire(self, tokens_estimate: int = 0) -> None:
+        """
+        Wait until a request can be sent, then take its capacity.
+
+        Args:
+            tokens_estimate: Estimated tokens the request will consume
+        """
+        while True:
+            wait = self._reserve(tokens_estimate)
+            if not wait:
+                return
+            logger.debug(f"Rate limit reached, waiting {wait:.2f}s")
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens_estimate: int = 0) -> None:
+        """
+        Wait until a request can be sent without blocking the event loop.
+
+        Args:
+            tokens_estimate: Estimated tokens the request will consume
+        """
+        while True:
+            wait = self._reserve(tokens_estimate)
+            if not wait:
+                return
+            logger.debug(f"Rate limit reached, waiting {wait:.2f}s")
+            await asyncio.sleep(wait)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Correct the buckets from the rate limit headers of a response.
+
+        The limit headers set the bucket sizes. The remaining headers only
+        lower the local counts, because requests still in flight have
+        already taken their share locally.
+
+        Args:
+            headers: Response headers
+        """
+        limit_requests = _header_number(headers, "x-ratelimit-limit-requests")
+        limit_tokens = _header_number(headers, "x-ratelimit-limit-tokens")
+        remaining_requests = _header_number(headers, "x-ratelimit-remaining-requests")
+        remaining_tokens = _header_number(headers, "x-ratelimit-remaining-tokens")
+
+        with self._lock:
+            self._refill(time.monotonic())
+            if limit_requests:
+                self.requests_per_minute = limit_requests
+            if limit_tokens:
+                self.tokens_per_minute = limit_tokens
+            if remaining_requests is not None:
+                self._available_requests = min(self._available_requests, remaining_requests)
+            if remaining_tokens is not None:
+                self._available_tokens = min(self._available_tokens, remaining_tokens)
+
+def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+    """
+    Read a numeric header.
+
+    Args:
+        headers: Response headers
+        name: Header name
+
+    Returns:
+        float: The header value, or None if it is missing or not a number
+    """
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+def estimate_request_tokens(request: Any) -> int:
+    """
+    Estimate the tokens an HTTP request will consume from its body size.
+
+    Args:
+        request: The outgoing httpx request
+
+    Returns:
+        int: Estimated tokens (0 for requests without a readable body)
+    """
+    try:
+        return len(request.content) // CHARS_PER_TOKEN
+    except Exception:
+        return 0
+
+@functools.lru_cache(maxsize=4)
+def get_rate_limiter(api_key: str) -> RateLimiter:
+    """
+    Get the process-wide rate limiter for an API key.
+
+    OpenAI enforces limits per organization, so every client using the
+    same key shares one set of buckets.
+
+    Args:
+        api_key: OpenAI API key
+
+    Returns:
+        RateLimiter: The key's rate limiter
+    """
+    return RateLimiter()
+
+def event_hooks(limiter: RateLimiter) -> Dict[str, List[Callable]]:
+    """
+    Build httpx event hooks that route a sync client's requests through a limiter.
+
+    Args:
+        limiter: The rate limiter
+
+    Returns:
+        Dict: Hooks for httpx.Client(event_hooks=...)
+    """
+    def on_request(request: Any) -> None:
+        limiter.acquire(estimate_request_tokens(request))
+
+    def on_response(response: Any) -> None:
+        limiter.update_from_headers(response.headers)
+
+    return {"request": [on_request], "response": [on_response]}
+
+def async_event_hooks(limiter: RateLimiter) -> Dict[str, List[Callable]]:
+    """
+    Build httpx event hooks that route an async client's requests through a limiter.
+
+    Args:
+        limiter: The rate limiter
+
+    Returns:
+        Dict: Hooks for httpx.AsyncClient(event_hooks=...)
+    """
+    async def on_request(request: Any) -> None:
+        await limiter.acquire_async(estimate_request_tokens(request))
+
+    async def on_response(response: Any) -> None:
+        limiter.update_from_headers(response.headers)
+
+    return {"request": [on_request], "response": [on_response]}
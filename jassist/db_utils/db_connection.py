@@ -2,6 +2,7 @@ import psycopg2
 from psycopg2 import pool
 import traceback
 import functools
+import threading
 from jassist.db_utils.db_env_utils import get_db_url
 from jassist.logger_utils.logger_utils import setup_logger
 
@@ -9,6 +10,11 @@ logger = setup_logger("db_connection", module="db_utils")
 
 # Global connection pool
 connection_pool = None
+_pool_lock = threading.Lock()
+
+# Pool bounds; the pool is shared by worker threads, so it must be thread-safe
+POOL_MIN_CONNECTIONS = 2
+POOL_MAX_CONNECTIONS = 16
 
 def initialize_db():
     """Initialize the database connection pool"""
@@ -33,7 +39,7 @@ def initialize_db():
             return False
 
         logger.info("Creating connection pool...")
-        connection_pool = pool.SimpleConnectionPool(1, 10, db_url)
+        connection_pool = pool.ThreadedConnectionPool(POOL_MIN_CONNECTIONS, POOL_MAX_CONNECTIONS, db_url)
         logger.info("Connection pool created")
         return True
 
@@ -46,7 +52,9 @@ def get_connection():
     """Get a connection from the pool"""
     global connection_pool
     if connection_pool is None:
-        initialize_db()
+        with _pool_lock:
+            if connection_pool is None:
+                initialize_db()
     return connection_pool.getconn()
 
 def return_connection(conn):
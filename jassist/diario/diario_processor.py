@@ -15,6 +15,7 @@ import psycopg2
 from psycopg2.extensions import register_adapter, AsIs
 
 from jassist.logger_utils.logger_utils import setup_logger
+from jassist.api_assistants_cliente.polling import poll_intervals
 from jassist.db_utils.db_connection import db_connection_handler
 from jassist.diario.utils.config_manager import load_json_config, get_config_dir
 from jassist.diario.utils.json_extractor import extract_json_from_text
@@ -164,6 +165,9 @@ def process_with_assistant(text: str) -> str:
         max_wait_time = 60  # Maximum wait time in seconds
         start_time = time.time()
         
+        # Poll quickly at first, then back off while the run is still going
+        intervals = poll_intervals()
+        
         while True:
             run_status = client.beta.threads.runs.retrieve(
                 thread_id=thread_id,
@@ -187,11 +191,13 @@ def process_with_assistant(text: str) -> str:
                 return ""
                 
             # Wait before checking again
-            time.sleep(1)
+            time.sleep(next(intervals))
         
-        # Get messages (most recent first)
+        # Get only the newest message, which is the assistant's reply
         messages = client.beta.threads.messages.list(
-            thread_id=thread_id
+            thread_id=thread_id,
+            limit=1,
+            order="desc"
         )
         
         # Get assistant's response (first message should be most recent)
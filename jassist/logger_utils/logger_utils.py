@@ -41,16 +41,17 @@ def setup_logger(name="jassist", module=None):
     Returns:
         A configured logger instance
     """
-    config = load_logger_config()
-    logging_config = config.get("logging", {})
-    
     # Get the logger instance
     logger = logging.getLogger(name)
     
-    # Prevent duplicate handlers if already configured
+    # Prevent duplicate handlers if already configured, and skip
+    # re-reading the config file on repeated calls
     if logger.hasHandlers():
         return logger
     
+    config = load_logger_config()
+    logging_config = config.get("logging", {})
+    
     # Determine if we should use module-specific configuration
     module_config = None
     if module and module in logging_config.get("modules", {}):